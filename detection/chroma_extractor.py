@@ -34,6 +34,26 @@ import numpy as np
 from detection.beat_detector import CH_GUITAR, CH_BASS, CH_LEAD_VOCAL  # noqa: F401
 
 
+# librosa wird lazy importiert (langsamer Import) — aber nur einmal geprobt.
+# Fehlt librosa, würde ein erneutes "import librosa" pro Beat jedes Mal
+# die komplette sys.path-Suche wiederholen.
+_librosa = None
+_librosa_probed = False
+
+
+def _get_librosa():
+    """librosa-Modul oder None; Ergebnis des ersten Imports wird gemerkt."""
+    global _librosa, _librosa_probed
+    if not _librosa_probed:
+        try:
+            import librosa
+            _librosa = librosa
+        except ImportError:
+            _librosa = None
+        _librosa_probed = True
+    return _librosa
+
+
 class StreamingChromaExtractor:
     """Rolling-Buffer Chroma-Extraktion für einen Mono-Audiokanal.
 
@@ -73,9 +93,12 @@ class StreamingChromaExtractor:
         # Optionaler Bandpass-Filter (bei Original-Abtastrate)
         self._bp_sos: Optional[np.ndarray] = None
         self._bp_zi:  Optional[np.ndarray] = None
+        self._sosfilt = None         # scipy-Funktionen einmal binden, nicht pro Block
+        self._resample_poly = None
         if bp_low is not None and bp_high is not None:
             try:
-                from scipy.signal import butter
+                from scipy.signal import butter, sosfilt
+                self._sosfilt = sosfilt
                 nyq = sample_rate / 2.0
                 self._bp_sos = butter(
                     4, [bp_low / nyq, bp_high / nyq], btype="band", output="sos"
@@ -106,15 +129,16 @@ class StreamingChromaExtractor:
 
         # Bandpass (optional, z.B. 30–300 Hz für Bass)
         if self._bp_sos is not None:
-            from scipy.signal import sosfilt
-            x, self._bp_zi = sosfilt(self._bp_sos, x.astype(np.float64),
-                                     zi=self._bp_zi)
+            x, self._bp_zi = self._sosfilt(self._bp_sos, x.astype(np.float64),
+                                           zi=self._bp_zi)
             x = x.astype(np.float32)
 
         # Dezimierung auf Ziel-Abtastrate
         if self._resample:
-            from scipy.signal import resample_poly
-            x = resample_poly(x, self._up, self._down).astype(np.float32)
+            if self._resample_poly is None:
+                from scipy.signal import resample_poly
+                self._resample_poly = resample_poly
+            x = self._resample_poly(x, self._up, self._down).astype(np.float32)
 
         # Rolling-Buffer: älteste Samples herausschieben, neue hinten einschreiben
         n = len(x)
@@ -134,9 +158,8 @@ class StreamingChromaExtractor:
         """
         if float(np.max(np.abs(self._buf))) < 1e-5:
             return None
-        try:
-            import librosa
-        except ImportError:
+        librosa = _get_librosa()
+        if librosa is None:
             return None
 
         y = self._buf.copy()
@@ -174,9 +197,8 @@ class StreamingChromaExtractor:
         """
         if bpm <= 0 or float(np.max(np.abs(self._buf))) < 1e-5:
             return 0.5
-        try:
-            import librosa
-        except ImportError:
+        librosa = _get_librosa()
+        if librosa is None:
             return 0.5
 
         hop = 128
@@ -149,24 +149,25 @@ class AudioHMM:
             if song.bpm > 0:
                 self._bpm_map[song.song_id] = song.bpm
 
+        # Takte einmal komplett laden statt eine Abfrage pro Feature-Vektor
+        all_bars = self.db.get_all_bars()   # nach (song_id, bar_num) sortiert
+        bars_by_id = {b.bar_id: b for b in all_bars}
         features = self.db.get_all_features()
         for fv in features:
-            bar = self.db.get_bar(fv.bar_id)
+            bar = bars_by_id.get(fv.bar_id)
             if bar is None:
                 continue
             key = StateKey(bar.song_id, bar.bar_num)
             self._features[key] = fv
             self._bars[key] = bar
 
-        # Part-Grenzen aufbauen
-        for key, bar in self._bars.items():
-            song_id = key.song_id
-            if song_id not in self._part_map:
-                self._part_map[song_id] = []
-            self._part_map[song_id].append((bar.bar_num, bar.part_name))
-
-        for song_id in self._part_map:
-            self._part_map[song_id].sort()
+        # Part-Grenzen aufbauen — in der SQL-Reihenfolge von get_all_bars(),
+        # damit ist jede Liste schon nach bar_num sortiert
+        for bar in all_bars:
+            if self._bars.get(StateKey(bar.song_id, bar.bar_num)) is not bar:
+                continue
+            self._part_map.setdefault(bar.song_id, []).append(
+                (bar.bar_num, bar.part_name))
 
         # Beam initial gleichverteilt
         self._init_beam()
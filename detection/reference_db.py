@@ -15,6 +15,7 @@ from __future__ import annotations
 import io
 import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -32,7 +33,9 @@ DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "live" / "data" / "re
 # Dataclasses
 # ---------------------------------------------------------------------------
 
-@dataclass
+# slots: get_all_bars()/get_all_features() liefern eine Instanz pro Takt der
+# ganzen Datenbank, die HMM und Matcher im Hot Path abfragen — kein __dict__
+@dataclass(slots=True)
 class SongRecord:
     song_id: str
     name: str
@@ -40,7 +43,7 @@ class SongRecord:
     total_bars: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BarRecord:
     bar_id: str        # e.g. "B0059"
     song_id: str
@@ -49,7 +52,7 @@ class BarRecord:
     audio_path: str    # relative repo path, e.g. "audio/All The Small Things/..."
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureVector:
     bar_id: str
     chroma: np.ndarray   # shape (12,), float32  — chroma_cqt mean
@@ -77,6 +80,14 @@ def _from_blob(data: bytes) -> np.ndarray:
     return np.load(io.BytesIO(data))
 
 
+# Einmal pro Thread-Verbindung gesetzt (siehe ReferenceDB._thread_conn)
+_CONN_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+"""
+_BUSY_TIMEOUT_SEC = 10.0
+
+
 # ---------------------------------------------------------------------------
 # ReferenceDB
 # ---------------------------------------------------------------------------
@@ -87,22 +98,99 @@ class ReferenceDB:
     def __init__(self, path: Path = DEFAULT_DB_PATH) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()  # .con = persistente Verbindung des Threads
+        self._tx = threading.local()     # .con = offene transaction()-Verbindung
+        # Alle Thread-Verbindungen, damit close() auch die von Pool-/Worker-
+        # Threads schließt. close() erhöht _conns_gen — Thread-Verbindungen
+        # einer älteren Generation sind geschlossen und werden neu geöffnet.
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_gen = 0
+        self._conns_lock = threading.Lock()
+        # Eigene Verbindung nur für data_version(): der Zähler ist pro
+        # Verbindung und nur mit Werten derselben Verbindung vergleichbar.
+        self._version_con: sqlite3.Connection | None = None
+        self._version_epoch = 0  # erhöht bei jedem Neuöffnen von _version_con
+        self._version_lock = threading.Lock()
         self._init_schema()
 
     # --- Connection context manager -----------------------------------------
 
+    def _thread_conn(self) -> sqlite3.Connection:
+        """Persistente Verbindung des aufrufenden Threads (lazy geöffnet).
+
+        Eine Verbindung pro Thread statt einer geteilten: Transaktionen
+        verschiedener Threads bleiben getrennt, und dank WAL blockieren Leser
+        (UI, Audio-Thread) nicht hinter einem laufenden Schreib-Commit.
+        """
+        con = getattr(self._local, "con", None)
+        if con is not None and self._local.gen != self._conns_gen:
+            con = None   # von close() geschlossen
+        if con is None:
+            # timeout = busy_timeout: Importer-Transaktionen (Rehearsal-App) und
+            # Chroma-Upserts können gleichzeitig schreiben wollen — warten statt
+            # nach den Default-5 s mit "database is locked" abbrechen.
+            con = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT_SEC,
+                                  check_same_thread=False)
+            con.row_factory = sqlite3.Row
+            # WAL ist persistent (Schema); synchronous gilt pro Verbindung.
+            # NORMAL: kein fsync pro Commit, nur beim Checkpoint — im WAL-Modus
+            # trotzdem korruptionssicher. Temp-B-Trees (ORDER BY/GROUP BY) im RAM.
+            con.executescript(_CONN_PRAGMAS)
+            with self._conns_lock:
+                self._conns.append(con)
+                self._local.gen = self._conns_gen
+            self._local.con = con
+        return con
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen, auch die anderer Threads.
+
+        Nur aufrufen, wenn kein anderer Thread die DB gerade benutzt. Spätere
+        Aufrufe öffnen pro Thread wieder eine neue Verbindung, die
+        data_version()-Verbindung ebenso.
+        """
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._conns_gen += 1
+        self._local.con = None
+        for con in conns:
+            con.close()
+        with self._version_lock:
+            if self._version_con is not None:
+                self._version_con.close()
+                self._version_con = None
+
     @contextmanager
     def _conn(self) -> Generator[sqlite3.Connection, None, None]:
-        con = sqlite3.connect(self.path, check_same_thread=False)
-        con.row_factory = sqlite3.Row
+        tx_con = getattr(self._tx, "con", None)
+        if tx_con is not None:
+            # Innerhalb von transaction(): Verbindung teilen, Commit macht der Block
+            yield tx_con
+            return
+        con = self._thread_conn()
         try:
             yield con
             con.commit()
         except Exception:
             con.rollback()
             raise
-        finally:
-            con.close()
+
+    @contextmanager
+    def transaction(self) -> Generator[None, None, None]:
+        """Alle ReferenceDB-Aufrufe im Block in einer Verbindung + Transaktion.
+
+        Ein Commit (ein fsync) am Ende statt einem pro upsert; bei Exception
+        wird alles zurückgerollt. Gilt pro Thread, verschachtelt ist no-op.
+        """
+        if getattr(self._tx, "con", None) is not None:
+            yield
+            return
+        with self._conn() as con:
+            self._tx.con = con
+            try:
+                yield
+            finally:
+                self._tx.con = None
 
     # --- Schema -----------------------------------------------------------------
 
@@ -156,6 +244,8 @@ class ReferenceDB:
                 CREATE INDEX IF NOT EXISTS idx_probe_events_session
                     ON probe_events(session_id, wav_offset);
             """)
+        # Migration einmal hier statt vor jedem Chroma-Upsert (PRAGMA pro Aufruf)
+        self._ensure_sample_count_column()
         log.debug("Reference DB initialised at %s", self.path)
 
     # --- Songs ------------------------------------------------------------------
@@ -191,22 +281,15 @@ class ReferenceDB:
 
     def delete_song(self, song_id: str) -> None:
         """Remove song and all associated bars + feature vectors."""
+        # Subquery statt bar_ids erst nach Python zu holen: kein Roundtrip,
+        # keine IN-Liste mit einem Platzhalter pro Takt (SQLite-Variablenlimit)
         with self._conn() as con:
-            bar_ids = [
-                r[0]
-                for r in con.execute(
-                    "SELECT bar_id FROM bars WHERE song_id=?", (song_id,)
-                ).fetchall()
-            ]
-            if bar_ids:
-                placeholders = ",".join("?" * len(bar_ids))
-                con.execute(
-                    f"DELETE FROM feature_vectors WHERE bar_id IN ({placeholders})",
-                    bar_ids,
-                )
-                con.execute(
-                    f"DELETE FROM bars WHERE bar_id IN ({placeholders})", bar_ids
-                )
+            con.execute(
+                "DELETE FROM feature_vectors WHERE bar_id IN "
+                "(SELECT bar_id FROM bars WHERE song_id=?)",
+                (song_id,),
+            )
+            con.execute("DELETE FROM bars WHERE song_id=?", (song_id,))
             con.execute("DELETE FROM songs WHERE song_id=?", (song_id,))
 
     # --- Bars -------------------------------------------------------------------
@@ -224,6 +307,44 @@ class ReferenceDB:
                 (bar.bar_id, bar.song_id, bar.bar_num, bar.part_name, bar.audio_path),
             )
 
+    def upsert_bars(self, bars: list[BarRecord]) -> int:
+        """Upsert many bars at once, writing only rows that actually changed.
+
+        Compares against the stored rows of the affected songs and issues a
+        single executemany for new or modified bars. Returns the number of
+        rows written.
+        """
+        if not bars:
+            return 0
+        song_ids = sorted({b.song_id for b in bars})
+        placeholders = ",".join("?" * len(song_ids))
+        with self._conn() as con:
+            stored = {
+                r[0]: tuple(r)
+                for r in con.execute(
+                    "SELECT bar_id, song_id, bar_num, part_name, audio_path "
+                    f"FROM bars WHERE song_id IN ({placeholders})",
+                    song_ids,
+                ).fetchall()
+            }
+            changed = []
+            for b in bars:
+                row = (b.bar_id, b.song_id, b.bar_num, b.part_name, b.audio_path)
+                if stored.get(b.bar_id) != row:
+                    changed.append(row)
+            if changed:
+                con.executemany(
+                    """INSERT INTO bars(bar_id, song_id, bar_num, part_name, audio_path)
+                       VALUES(?, ?, ?, ?, ?)
+                       ON CONFLICT(bar_id) DO UPDATE SET
+                           song_id=excluded.song_id,
+                           bar_num=excluded.bar_num,
+                           part_name=excluded.part_name,
+                           audio_path=excluded.audio_path""",
+                    changed,
+                )
+        return len(changed)
+
     def get_bars_for_song(self, song_id: str) -> list[BarRecord]:
         with self._conn() as con:
             rows = con.execute(
@@ -233,6 +354,19 @@ class ReferenceDB:
             ).fetchall()
         return [BarRecord(**dict(r)) for r in rows]
 
+    def get_all_bars(self) -> list[BarRecord]:
+        """Alle Takte aller Songs in einer Abfrage (statt get_bar() je bar_id).
+
+        Sortiert nach (song_id, bar_num) — per idx_bars_song_num in SQLite,
+        Aufrufer müssen nicht nachsortieren.
+        """
+        with self._conn() as con:
+            rows = con.execute(
+                "SELECT bar_id, song_id, bar_num, part_name, audio_path FROM bars "
+                "ORDER BY song_id, bar_num"
+            ).fetchall()
+        return [BarRecord(**dict(r)) for r in rows]
+
     def get_bar(self, bar_id: str) -> BarRecord | None:
         with self._conn() as con:
             row = con.execute(
@@ -283,8 +417,14 @@ class ReferenceDB:
     # --- Feature Vectors --------------------------------------------------------
 
     def upsert_feature(self, fv: FeatureVector) -> None:
+        self.upsert_features([fv])
+
+    def upsert_features(self, fvs: Sequence[FeatureVector]) -> None:
+        """Upsert many feature vectors with a single executemany (one commit)."""
+        if not fvs:
+            return
         with self._conn() as con:
-            con.execute(
+            con.executemany(
                 """INSERT INTO feature_vectors(bar_id, chroma, mfcc, onset, rms)
                    VALUES(?, ?, ?, ?, ?)
                    ON CONFLICT(bar_id) DO UPDATE SET
@@ -292,13 +432,16 @@ class ReferenceDB:
                        mfcc=excluded.mfcc,
                        onset=excluded.onset,
                        rms=excluded.rms""",
-                (
-                    fv.bar_id,
-                    _blob(fv.chroma),
-                    _blob(fv.mfcc),
-                    _blob(fv.onset),
-                    float(fv.rms),
-                ),
+                [
+                    (
+                        fv.bar_id,
+                        _blob(fv.chroma),
+                        _blob(fv.mfcc),
+                        _blob(fv.onset),
+                        float(fv.rms),
+                    )
+                    for fv in fvs
+                ],
             )
 
     def upsert_bar_chroma(
@@ -316,42 +459,71 @@ class ReferenceDB:
 
         Gibt True zurück wenn der Bar in der DB gefunden wurde, sonst False.
         """
-        bar = self.get_bar_by_num(song_id, bar_num)
-        if bar is None:
-            return False
+        return self.upsert_bar_chromas(song_id, {bar_num: chroma}) == 1
 
-        chroma_arr = np.array(chroma, dtype=np.float32)
-        self._ensure_sample_count_column()
+    def upsert_bar_chromas(
+        self,
+        song_id: str,
+        chromas: "dict[int, np.ndarray]",
+    ) -> int:
+        """Batch-Variante von upsert_bar_chroma für {bar_num: chroma}.
 
-        with self._conn() as con:
-            row = con.execute(
-                "SELECT chroma, COALESCE(sample_count, 1) AS n "
-                "FROM feature_vectors WHERE bar_id=?",
-                (bar.bar_id,),
-            ).fetchone()
+        Alle Takte eines Songs in einer Verbindung/Transaktion: ein SELECT
+        über bars ⟕ feature_vectors, dann je ein executemany für Inserts und
+        Updates — statt vier Verbindungen pro Takt.
 
-            if row is None:
-                # Neu anlegen: nur Chroma vorhanden, Rest = 0
-                zero20 = np.zeros(20, dtype=np.float32)
-                zero16 = np.zeros(16, dtype=np.float32)
-                con.execute(
+        Gibt die Anzahl der Takte zurück, die in der DB gefunden wurden.
+        """
+        if not chromas:
+            return 0
+
+        with self._conn() as con:
+            existing: dict[int, sqlite3.Row] = {}
+            for row in con.execute(
+                "SELECT b.bar_num, b.bar_id, fv.chroma, "
+                "COALESCE(fv.sample_count, 1) AS n "
+                "FROM bars b LEFT JOIN feature_vectors fv ON fv.bar_id = b.bar_id "
+                "WHERE b.song_id=?",
+                (song_id,),
+            ):
+                existing.setdefault(row["bar_num"], row)
+
+            inserts: list[tuple] = []
+            updates: list[tuple] = []
+            zero20 = _blob(np.zeros(20, dtype=np.float32))
+            zero16 = _blob(np.zeros(16, dtype=np.float32))
+            for bar_num, chroma in chromas.items():
+                row = existing.get(bar_num)
+                if row is None:
+                    continue
+                chroma_arr = np.array(chroma, dtype=np.float32)
+                if row["chroma"] is None:
+                    # Neu anlegen: nur Chroma vorhanden, Rest = 0
+                    inserts.append((row["bar_id"], _blob(chroma_arr), zero20, zero16))
+                else:
+                    # Inkrementelles Averaging
+                    n = int(row["n"])
+                    old_chroma = _from_blob(row["chroma"])
+                    new_chroma = ((old_chroma * n) + chroma_arr) / (n + 1)
+                    updates.append(
+                        (_blob(new_chroma.astype(np.float32)), n + 1, row["bar_id"])
+                    )
+
+            if inserts:
+                con.executemany(
                     "INSERT INTO feature_vectors "
                     "(bar_id, chroma, mfcc, onset, rms, sample_count) "
                     "VALUES (?, ?, ?, ?, 0.0, 1)",
-                    (bar.bar_id, _blob(chroma_arr), _blob(zero20), _blob(zero16)),
+                    inserts,
                 )
-            else:
-                # Inkrementelles Averaging
-                n = int(row["n"])
-                old_chroma = _from_blob(row["chroma"])
-                new_chroma = ((old_chroma * n) + chroma_arr) / (n + 1)
-                con.execute(
+            if updates:
+                con.executemany(
                     "UPDATE feature_vectors "
                     "SET chroma=?, sample_count=? "
                     "WHERE bar_id=?",
-                    (_blob(new_chroma.astype(np.float32)), n + 1, bar.bar_id),
+                    updates,
                 )
-        return True
+        return len(inserts) + len(updates)
 
     def _ensure_sample_count_column(self) -> None:
         """Fügt sample_count-Spalte zu feature_vectors hinzu falls fehlend (Migration)."""
@@ -416,6 +588,21 @@ class ReferenceDB:
             ).fetchall()
         return {r["bar_num"]: _from_blob(r["chroma"]) for r in rows}
 
+    def feature_bar_ids(self, song_id: str) -> set[str]:
+        """bar_ids eines Songs, für die schon ein Feature-Vektor existiert.
+
+        Nur die IDs — keine BLOBs laden, wenn nur Existenz gefragt ist.
+        """
+        with self._conn() as con:
+            rows = con.execute(
+                """SELECT fv.bar_id
+                   FROM feature_vectors fv
+                   JOIN bars b ON b.bar_id = fv.bar_id
+                   WHERE b.song_id = ?""",
+                (song_id,),
+            ).fetchall()
+        return {r[0] for r in rows}
+
     def bars_without_features(self) -> list[BarRecord]:
         """Return bars that have an audio_path but no feature vector yet."""
         with self._conn() as con:
@@ -523,6 +710,25 @@ class ReferenceDB:
             for r in rows
         ]
 
+    def data_version(self) -> tuple[int, int]:
+        """Änderungszähler der DB, von jedem Thread aus vergleichbar.
+
+        PRAGMA data_version ändert sich bei Commits jeder anderen Verbindung —
+        die Thread-Verbindungen dieses Objekts ebenso wie fremde Prozesse (z.B.
+        Rehearsal-App schreibt Chromas, während der Server läuft). Der Zähler
+        gilt pro Verbindung, daher liest ihn immer dieselbe, nie schreibende
+        Verbindung; die Epoche unterscheidet Werte über ein close() hinweg.
+        Gleicher Wert → seit dem letzten Aufruf wurde nichts geschrieben.
+        """
+        with self._version_lock:
+            if self._version_con is None:
+                self._version_con = sqlite3.connect(
+                    self.path, timeout=_BUSY_TIMEOUT_SEC, check_same_thread=False,
+                )
+                self._version_epoch += 1
+            con = self._version_con
+            return self._version_epoch, con.execute("PRAGMA data_version").fetchone()[0]
+
     # --- Stats ------------------------------------------------------------------
 
     def stats(self) -> dict:
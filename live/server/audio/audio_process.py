@@ -29,11 +29,21 @@ import logging
 import queue
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 
+# sounddevice einmal beim Import prüfen statt bei jedem list_devices()/Start.
+# OSError: Paket da, aber PortAudio-Library fehlt.
+try:
+    import sounddevice as sd
+    _SD_IMPORT_ERROR: str | None = None
+except (ImportError, OSError) as _exc:
+    sd = None
+    _SD_IMPORT_ERROR = str(_exc)
+
 from detection.beat_detector import OnsetDetector, OnsetEvent as _OnsetEvent
 from detection.bar_tracker import (
     BarTracker,
@@ -59,6 +69,40 @@ SAMPLE_RATE    = 48_000
 BLOCK_SIZE     = 2048
 CHANNELS_TOTAL = 18
 
+# Zuletzt gewählte Songs, deren Referenz-Chromas im Speicher bleiben
+# (Setlist-Wechsel A → B → A ohne erneute SQLite-Abfrage)
+_REF_CACHE_SIZE = 16
+
+
+# ---------------------------------------------------------------------------
+# Referenz-Chromas als parallele Arrays
+# ---------------------------------------------------------------------------
+
+_EMPTY_REF: tuple[np.ndarray, np.ndarray] = (
+    np.empty(0, dtype=np.int64),
+    np.empty((0, 12), dtype=np.float32),
+)
+
+
+def _ref_arrays(ref: dict[int, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """{bar_num: chroma} → (bar_nums, L2-normierte Chroma-Matrix).
+
+    Takte mit Null-Vektor werden ausgelassen. Reihenfolge wie im Dict, damit
+    argmax bei Gleichstand denselben Takt liefert wie die frühere Schleife.
+    """
+    bar_nums: list[int] = []
+    rows: list[np.ndarray] = []
+    for bnum, vec in ref.items():
+        v = np.asarray(vec, dtype=np.float32)
+        n = float(np.linalg.norm(v))
+        if n < 1e-8:
+            continue
+        bar_nums.append(bnum)
+        rows.append(v / n)
+    if not rows:
+        return _EMPTY_REF
+    return np.array(bar_nums, dtype=np.int64), np.vstack(rows)
+
 
 # ---------------------------------------------------------------------------
 # Nachrichten vom Audio-Thread an FastAPI
@@ -248,6 +292,14 @@ class AudioProcess:
 
         # Referenz-Chromas für Takt-Erkennung: {bar_num: chroma_array}
         self._ref_chromas: dict[int, np.ndarray] = {}
+        # Dieselben Daten als (bar_nums, normierte Matrix) für den Chroma-Worker
+        self._ref_arrays: tuple[np.ndarray, np.ndarray] = _EMPTY_REF
+        # LRU song_id → (_ref_chromas, _ref_arrays). Die Rehearsal-App schreibt
+        # zur Laufzeit in dieselbe reference.db (Chroma-Store, Recording-
+        # Import) — der Cache gilt nur für den DB-Stand _ref_cache_version.
+        self._ref_cache: OrderedDict[str, tuple[dict, tuple]] = OrderedDict()
+        self._ref_cache_version: tuple[int, int] | None = None
+        self._ref_cache_lock = threading.Lock()
         self._current_song_id: str = ""
         self._current_bpm: float = 120.0
 
@@ -302,8 +354,9 @@ class AudioProcess:
 
     @staticmethod
     def list_devices() -> list[dict]:
+        if sd is None:
+            return [{"error": _SD_IMPORT_ERROR}]
         try:
-            import sounddevice as sd
             devices = sd.query_devices()
             return [
                 {
@@ -327,6 +380,26 @@ class AudioProcess:
             error=self._error,
         ).to_dict()
 
+    def _ref_cache_get(self, song_id: str) -> tuple[dict, tuple] | None:
+        """LRU-Eintrag für song_id, sofern die DB seitdem unverändert blieb."""
+        if self._ref_db is None:
+            return None
+        with self._ref_cache_lock:
+            entry = self._ref_cache.get(song_id)
+            if entry is None:
+                return None
+            try:
+                version = self._ref_db.data_version()
+            except Exception:
+                version = None
+            if version != self._ref_cache_version:
+                # Zwischenzeitlich geschrieben — alle Einträge können veraltet sein
+                self._ref_cache.clear()
+                self._ref_cache_version = None
+                return None
+            self._ref_cache.move_to_end(song_id)
+            return entry
+
     def set_song(
         self,
         bpm: float,
@@ -394,10 +467,18 @@ class AudioProcess:
         )
 
         # Referenz-Chromas laden (für Takt-Erkennung via Kosinus-Ähnlichkeit)
+        # Gleicher Song erneut gewählt (Neustart) geht denselben Weg: der
+        # geladene Song liegt im LRU, ein DB-Schreibzugriff erzwingt Neuladen.
         self._current_song_id = song_id
         self._current_bpm = bpm
-        if self._ref_db is not None and song_id:
+        cached = self._ref_cache_get(song_id) if song_id else None
+        if cached is not None:
+            self._ref_chromas, self._ref_arrays = cached
+        elif self._ref_db is not None and song_id:
             try:
+                # Version vor dem Lesen: ein Commit währenddessen macht den
+                # Eintrag beim nächsten Lookup ungültig statt ihn zu verdecken
+                version = self._ref_db.data_version()
                 self._ref_chromas = self._ref_db.get_all_bar_chromas(song_id)
                 log.info(
                     "Referenz-Chromas geladen: %d Takte für Song %s",
@@ -406,8 +487,19 @@ class AudioProcess:
             except Exception as exc:
                 log.warning("Referenz-Chromas konnten nicht geladen werden: %s", exc)
                 self._ref_chromas = {}
+                self._ref_arrays = _EMPTY_REF
+            else:
+                self._ref_arrays = _ref_arrays(self._ref_chromas)
+                with self._ref_cache_lock:
+                    if version != self._ref_cache_version:
+                        self._ref_cache.clear()
+                        self._ref_cache_version = version
+                    self._ref_cache[song_id] = (self._ref_chromas, self._ref_arrays)
+                    if len(self._ref_cache) > _REF_CACHE_SIZE:
+                        self._ref_cache.popitem(last=False)
         else:
             self._ref_chromas = {}
+            self._ref_arrays = _EMPTY_REF
 
         log.info(
             "BarTracker + Chroma konfiguriert: bpm=%.1f  song=%s  ref_bars=%d",
@@ -417,11 +509,10 @@ class AudioProcess:
     # --- Main Thread ----------------------------------------------------------
 
     def _run(self) -> None:
-        try:
-            import sounddevice as sd
-        except ImportError:
+        if sd is None:
             log.warning(
-                "sounddevice nicht installiert — AudioProcess läuft im Stub-Modus."
+                "sounddevice nicht verfügbar (%s) — AudioProcess läuft im Stub-Modus.",
+                _SD_IMPORT_ERROR,
             )
             self._run_stub()
             return
@@ -561,35 +652,33 @@ class AudioProcess:
 
         # --- Onset-Detection: Kick + Snare + Crash ---
         onsets = self.onset_detector.process_block(indata)
+        # Pro Onset mehrfach gebrauchte Attribute/Methoden einmal lokal binden
+        emit = self._emit
         for ev in onsets:
-            self._emit(OnsetUpdate(onset_type=ev.type, energy=ev.energy))
+            etype = ev.type
+            energy = ev.energy
+            emit(OnsetUpdate(onset_type=etype, energy=energy))
             if el is not None:
-                el.log(ev.type, wav_offset=wav_offset, energy=round(ev.energy, 6))
+                el.log(etype, wav_offset=wav_offset, energy=round(energy, 6))
 
             t_ev = wav_offset if wav_offset is not None else 0.0
 
             # Guitar-Chroma-Snapshot bei Beat-Events → Background-Worker
-            if ev.type in ("kick", "snare"):
-                try:
-                    snap = self._guitar_extractor.snapshot()
-                    self._chroma_queue.put_nowait(
-                        {"kind": "guitar", "snap": snap, "t": t_ev}
-                    )
-                except queue.Full:
-                    pass  # Queue voll → überspringen, kein Blocking
+            if etype == "kick" or etype == "snare":
+                self._queue_chroma("guitar", self._guitar_extractor, t_ev)
 
             # AnchorMatcher: Onset-basierte Trigger
             if matcher is not None and not matcher.done:
-                if ev.type == "kick":
-                    anc = matcher.process_kick(t_ev, ev.energy)
-                elif ev.type == "snare":
-                    anc = matcher.process_snare(t_ev, ev.energy)
-                elif ev.type == "crash":
-                    anc = matcher.process_crash(t_ev, ev.energy)
+                if etype == "kick":
+                    anc = matcher.process_kick(t_ev, energy)
+                elif etype == "snare":
+                    anc = matcher.process_snare(t_ev, energy)
+                elif etype == "crash":
+                    anc = matcher.process_crash(t_ev, energy)
                 else:
                     anc = None
                 if anc is not None:
-                    self._emit(AnchorMatch(anchor=anc, t=t_ev))
+                    emit(AnchorMatch(anchor=anc, t=t_ev))
                     if el is not None:
                         el.log(
                             "anchor_matched",
@@ -601,37 +690,57 @@ class AudioProcess:
                             bar_num=anc.get("bar_num"),
                             beat=anc.get("beat", ""),
                             part_hint=anc.get("part_hint", ""),
-                            trigger=ev.type,
+                            trigger=etype,
                         )
 
             # BarTracker + Bar-Logging
             with self._bar_tracker_lock:
-                if ev.type == "kick":
-                    self._bar_tracker.process_kick(t_ev, energy=ev.energy)
-                elif ev.type == "snare":
-                    self._bar_tracker.process_snare(t_ev, energy=ev.energy)
-                elif ev.type == "crash":
-                    self._bar_tracker.process_crash(t_ev, energy=ev.energy)
-
-                bar_times = sorted(self._bar_tracker.get_latest_bars())
-                bpm_val   = self._bar_tracker.get_bpm()
-                for bar_idx, bt in enumerate(bar_times):
-                    if bar_idx < self._logged_bar_count:
-                        continue
+                # set_song() tauscht den Tracker unter dem Lock — erst hier binden
+                tracker = self._bar_tracker
+                if etype == "kick":
+                    tracker.process_kick(t_ev, energy=energy)
+                elif etype == "snare":
+                    tracker.process_snare(t_ev, energy=energy)
+                elif etype == "crash":
+                    tracker.process_crash(t_ev, energy=energy)
+
+                # get_latest_bars() liefert bereits eine Kopie → in-place sortieren.
+                # Meist hat das Onset noch keinen neuen Takt überschritten: dann
+                # ohne Schleife über die schon geloggten Takte weiter.
+                bar_times = tracker.get_latest_bars()
+                bar_times.sort()
+                start = self._logged_bar_count
+                if start >= len(bar_times) or bar_times[start] > t_ev:
+                    continue
+                bpm_val = tracker.get_bpm()
+                for bar_idx in range(start, len(bar_times)):
+                    bt = bar_times[bar_idx]
                     if bt > t_ev:
                         break
                     if el is not None:
                         el.log("bar", wav_offset=bt, bar_num=bar_idx + 1, bpm=bpm_val)
                     self._logged_bar_count = bar_idx + 1
-                    self._emit(BarUpdate(bar_num=bar_idx + 1, bpm=bpm_val or 0.0))
+                    emit(BarUpdate(bar_num=bar_idx + 1, bpm=bpm_val or 0.0))
                     # Bass-Chroma-Snapshot für neuen Takt → Background-Worker
-                    try:
-                        snap = self._bass_extractor.snapshot()
-                        self._chroma_queue.put_nowait(
-                            {"kind": "bass", "snap": snap, "t": bt}
-                        )
-                    except queue.Full:
-                        pass
+                    self._queue_chroma("bass", self._bass_extractor, bt)
+
+    def _queue_chroma(self, kind: str, extractor, t: float) -> None:
+        """Snapshot an den Chroma-Worker geben — nie blockierend.
+
+        Queue voll (Worker hängt hinterher oder ist mangels librosa inaktiv)
+        → Takt überspringen. Vorab per full() prüfen statt bei jedem Beat
+        queue.Full zu werfen; der Snapshot wird dann gar nicht erst kopiert.
+        Das except bleibt nur für den seltenen Fall, dass stop() gleichzeitig
+        den letzten Platz belegt.
+        """
+        if self._chroma_queue.full():
+            return
+        try:
+            self._chroma_queue.put_nowait(
+                {"kind": kind, "snap": extractor.snapshot(), "t": t}
+            )
+        except queue.Full:
+            pass
 
     # --- Chroma-Worker (Background-Thread) ------------------------------------
 
@@ -693,22 +802,17 @@ class AudioProcess:
                     continue
                 chroma = (c / norm).tolist()
 
-                # Kosinus-Ähnlichkeit gegen Referenz-Chromas
+                # Kosinus-Ähnlichkeit gegen Referenz-Chromas (ein Matrix-Vektor-Produkt)
                 bar_num, confidence = -1, 0.0
-                ref = self._ref_chromas  # atomare Referenz (GIL-sicher)
-                if ref:
+                ref_bars, ref_mat = self._ref_arrays  # atomare Referenz (GIL-sicher)
+                if len(ref_bars):
                     live_vec = np.array(chroma, dtype=np.float32)
                     live_norm = float(np.linalg.norm(live_vec))
-                    best_sim = -1.0
                     if live_norm > 1e-8:
-                        for bnum, ref_vec in ref.items():
-                            rn = float(np.linalg.norm(ref_vec))
-                            if rn < 1e-8:
-                                continue
-                            sim = float(np.dot(live_vec, ref_vec) / (live_norm * rn))
-                            if sim > best_sim:
-                                best_sim, bar_num = sim, bnum
-                    confidence = max(0.0, best_sim)
+                        sims = ref_mat @ live_vec
+                        best = int(np.argmax(sims))
+                        bar_num = int(ref_bars[best])
+                        confidence = max(0.0, float(sims[best]) / live_norm)
 
                 update = ChromaUpdate(
                     kind=task["kind"],
@@ -113,8 +113,8 @@ def import_from_recording(
             for sid, s in db_raw.get("songs", {}).items()
         }
 
+    # ReferenceDB() migriert sample_count bereits in _init_schema()
     ref_db = ReferenceDB(ref_db_path)
-    _ensure_sample_count_column(ref_db)
 
     stats = ImportStats()
 
@@ -146,13 +146,22 @@ def import_from_recording(
 
             seg_offset = float(getattr(song_ann, "segment_start_t", 0.0))
             bpm        = bpm_map.get(song_id, 120.0)
+            bar_dur    = 60.0 / bpm * 4  # 1 Takt = 4 Beats
             stats.songs_processed += 1
 
+            # Bar-Records einmal pro Song laden statt get_bar_by_num() pro Marker
+            bars_by_num: dict = {}
+            for rec in ref_db.get_bars_for_song(song_id):
+                bars_by_num.setdefault(rec.bar_num, rec)
+
             log.info(
                 "Song: %s (%s)  — %d Takte annotiert, Offset %.2f s",
                 song_id, song_ann.song_name, len(song_ann.markers), seg_offset,
             )
 
+            # Audio lesen + Features berechnen ohne offene Transaktion —
+            # sonst bliebe reference.db für die ganze Analyse write-gesperrt
+            computed: list[tuple[int, str, np.ndarray, np.ndarray, np.ndarray, float]] = []
             for i, marker in enumerate(song_ann.markers):
                 bar_num = marker.bar_num
 
@@ -161,9 +170,8 @@ def import_from_recording(
                 if i + 1 < len(song_ann.markers):
                     t_end = seg_offset + song_ann.markers[i + 1].t
                 else:
-                    # Letzter Takt: 4 Sekunden Fallback (1 Takt bei 60 BPM)
-                    beat_dur = 60.0 / bpm * 4  # 1 Takt = 4 Beats
-                    t_end = t_start + beat_dur
+                    # Letzter Takt: eine Taktlänge als Fallback
+                    t_end = t_start + bar_dur
 
                 frame_start = max(0, int(t_start * file_sr))
                 frame_end   = min(total_frames, int(t_end * file_sr))
@@ -196,28 +204,33 @@ def import_from_recording(
                     continue
 
                 # Bar-Record in reference.db suchen
-                bar_rec = ref_db.get_bar_by_num(song_id, bar_num)
+                bar_rec = bars_by_num.get(bar_num)
                 if bar_rec is None:
                     log.debug("  T%03d kein Bar-Record für %s — übersprungen",
                               bar_num, song_id)
                     stats.bars_skipped += 1
                     continue
 
-                # Feature-Vektor inkrementell einarbeiten
-                is_new = _upsert_averaged(
-                    ref_db, bar_rec.bar_id, chroma, mfcc, onset, float(rms)
-                )
-                if is_new:
-                    stats.bars_inserted += 1
-                else:
-                    stats.bars_updated += 1
-                log.debug(
-                    "  T%03d %s  %s",
-                    bar_num,
-                    "NEU" if is_new else "gemittelt",
-                    bar_rec.bar_id,
+                computed.append(
+                    (bar_num, bar_rec.bar_id, chroma, mfcc, onset, float(rms))
                 )
 
+            # Nur die Upserts eines Songs in einer kurzen Transaktion (ein Commit)
+            with ref_db.transaction():
+                for bar_num, bar_id, chroma, mfcc, onset, rms in computed:
+                    # Feature-Vektor inkrementell einarbeiten
+                    is_new = _upsert_averaged(ref_db, bar_id, chroma, mfcc, onset, rms)
+                    if is_new:
+                        stats.bars_inserted += 1
+                    else:
+                        stats.bars_updated += 1
+                    log.debug(
+                        "  T%03d %s  %s",
+                        bar_num,
+                        "NEU" if is_new else "gemittelt",
+                        bar_id,
+                    )
+
     log.info(
         "Import fertig: %d Songs | %d neu | %d gemittelt | "
         "%d übersprungen | %d Fehler",
@@ -234,19 +247,6 @@ def import_from_recording(
 # Interne Hilfsfunktionen
 # ---------------------------------------------------------------------------
 
-def _ensure_sample_count_column(ref_db: "ReferenceDB") -> None:
-    """Fügt ``sample_count``-Spalte zu ``feature_vectors`` hinzu falls fehlend."""
-    with ref_db._conn() as con:
-        cols = [row[1] for row in
-                con.execute("PRAGMA table_info(feature_vectors)").fetchall()]
-        if "sample_count" not in cols:
-            con.execute(
-                "ALTER TABLE feature_vectors "
-                "ADD COLUMN sample_count INTEGER DEFAULT 1"
-            )
-            log.info("feature_vectors.sample_count-Spalte angelegt (Migration)")
-
-
 def _upsert_averaged(
     ref_db: "ReferenceDB",
     bar_id: str,
@@ -36,6 +36,7 @@ import argparse
 import json
 import logging
 import sys
+from itertools import groupby
 from pathlib import Path
 
 import numpy as np
@@ -43,11 +44,6 @@ import numpy as np
 # Repo-Root bestimmen (lighting.ai/)
 _REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)-24s %(levelname)-5s %(message)s",
-    datefmt="%H:%M:%S",
-)
 log = logging.getLogger("importer")
 
 
@@ -198,14 +194,16 @@ def import_from_repo(
             parts_of_song.keys(),
             key=lambda pid: parts_of_song[pid].get("pos", 0),
         )
+        # Bars je Part in einem Durchlauf zählen (statt pro Part alle Bars)
+        bars_per_part: dict[str, int] = {}
+        for _, b in song_bars_raw:
+            pid = b.get("part_id")
+            bars_per_part[pid] = bars_per_part.get(pid, 0) + 1
         part_offset: dict[str, int] = {}
         offset = 0
         for pid in sorted_part_ids:
             part_offset[pid] = offset
-            n_bars_in_part = sum(
-                1 for _, b in song_bars_raw if b.get("part_id") == pid
-            )
-            offset += n_bars_in_part
+            offset += bars_per_part.get(pid, 0)
 
         # Part-Namen aus split_markers.part_starts (Pfad A) aufbauen
         part_starts: list[dict] = sm.get("part_starts", [])
@@ -260,6 +258,10 @@ def import_from_repo(
                 song_id, song_name, total_bars, bpm,
             )
 
+        # Bar-Zeilen vorab berechnen: ein executemany nur für geänderte Bars
+        # statt eines Upserts pro Bar bei jedem Import-Lauf
+        bar_rows: list[tuple[str, dict, int, int]] = []   # (bar_id, data, bar_num, bar_num_raw)
+        bar_records: list[BarRecord] = []
         for bar_id, bar_data in song_bars:
             bar_num_raw = bar_data.get("bar_num", 1)
 
@@ -277,7 +279,8 @@ def import_from_repo(
                 pid = bar_data.get("part_id", "")
                 part_name = parts_of_song.get(pid, {}).get("name", "") or _part_name_from_path(bar_data.get("audio", ""))
 
-            ref_db.upsert_bar(BarRecord(
+            bar_rows.append((bar_id, bar_data, bar_num, bar_num_raw))
+            bar_records.append(BarRecord(
                 bar_id=bar_id,
                 song_id=song_id,
                 bar_num=bar_num,
@@ -285,8 +288,13 @@ def import_from_repo(
                 audio_path=bar_data.get("audio", ""),
             ))
 
+        # Features ohne offene Transaktion berechnen — die librosa-Analyse
+        # soll reference.db nicht für andere Schreiber sperren
+        have_features = set() if force else ref_db.feature_bar_ids(song_id)
+        features: list[FeatureVector] = []
+        for bar_id, bar_data, bar_num, bar_num_raw in bar_rows:
             # Bereits vorhanden?
-            if not force and ref_db.get_feature(bar_id) is not None:
+            if bar_id in have_features:
                 total_skipped += 1
                 continue
 
@@ -300,17 +308,10 @@ def import_from_repo(
                     continue
                 try:
                     chroma, mfcc, onset, rms = extract_features_from_array(segment, ref_sr, bpm=bpm)
-                    ref_db.upsert_feature(FeatureVector(
-                        bar_id=bar_id,
-                        chroma=chroma,
-                        mfcc=mfcc,
-                        onset=onset,
-                        rms=rms,
-                    ))
-                    total_features += 1
                 except Exception as exc:
                     log.warning("  T%03d Feature-Extraktion fehlgeschlagen: %s", bar_num, exc)
                     total_missing += 1
+                    continue
 
             else:
                 # Pfad B: einzelne MP3-Datei
@@ -327,17 +328,25 @@ def import_from_repo(
                     continue
                 try:
                     chroma, mfcc, onset, rms = extract_features(audio_abs, bpm=bpm)
-                    ref_db.upsert_feature(FeatureVector(
-                        bar_id=bar_id,
-                        chroma=chroma,
-                        mfcc=mfcc,
-                        onset=onset,
-                        rms=rms,
-                    ))
-                    total_features += 1
                 except Exception as exc:
                     log.warning("  T%03d Feature-Extraktion fehlgeschlagen: %s", bar_num, exc)
                     total_missing += 1
+                    continue
+
+            features.append(FeatureVector(
+                bar_id=bar_id,
+                chroma=chroma,
+                mfcc=mfcc,
+                onset=onset,
+                rms=rms,
+            ))
+
+        # Bars + Features eines Songs in einer kurzen Transaktion (ein Commit)
+        with ref_db.transaction():
+            n_changed = ref_db.upsert_bars(bar_records)
+            ref_db.upsert_features(features)
+        log.debug("  %d/%d Bars neu oder geändert", n_changed, len(bar_records))
+        total_features += len(features)
 
     stats = ref_db.stats()
     log.info("")
@@ -393,25 +402,30 @@ def compute_missing_features(
 
     ok = 0
     fail = 0
-    for bar in missing:
-        bpm = bpm_map.get(bar.song_id, 120.0)
-        audio_abs = audio_root.parent / bar.audio_path
-        if not audio_abs.exists():
-            fail += 1
-            continue
-        try:
-            chroma, mfcc, onset, rms = extract_features(audio_abs, bpm=bpm)
-            ref_db.upsert_feature(FeatureVector(
-                bar_id=bar.bar_id,
-                chroma=chroma,
-                mfcc=mfcc,
-                onset=onset,
-                rms=rms,
-            ))
-            ok += 1
-        except Exception as exc:
-            log.warning("T%03d %s: %s", bar.bar_num, bar.audio_path, exc)
-            fail += 1
+    # missing ist nach song_id sortiert — pro Song ein executemany + Commit
+    # statt einem Commit pro Bar
+    for song_id, song_bars in groupby(missing, key=lambda b: b.song_id):
+        bpm = bpm_map.get(song_id, 120.0)
+        features: list[FeatureVector] = []
+        for bar in song_bars:
+            audio_abs = audio_root.parent / bar.audio_path
+            if not audio_abs.exists():
+                fail += 1
+                continue
+            try:
+                chroma, mfcc, onset, rms = extract_features(audio_abs, bpm=bpm)
+                features.append(FeatureVector(
+                    bar_id=bar.bar_id,
+                    chroma=chroma,
+                    mfcc=mfcc,
+                    onset=onset,
+                    rms=rms,
+                ))
+                ok += 1
+            except Exception as exc:
+                log.warning("T%03d %s: %s", bar.bar_num, bar.audio_path, exc)
+                fail += 1
+        ref_db.upsert_features(features)
 
     log.info("Fertig: %d neu berechnet, %d fehlgeschlagen", ok, fail)
 
@@ -457,6 +471,14 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    # Logging erst im CLI-Einstieg konfigurieren — beim Import durch den
+    # Live-Server (compute_missing_features) gilt dessen Konfiguration.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(name)-24s %(levelname)-5s %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
     db_json = Path(args.db_json)
     audio_root = Path(args.audio_root)
     ref_db = Path(args.ref_db)
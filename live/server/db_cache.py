@@ -32,6 +32,22 @@ def _repo_root(cfg: Config) -> Path:
     return cfg.base_dir.parent
 
 
+def _write_if_changed(dest: Path, content: bytes) -> bool:
+    """Write content to dest unless the file already holds exactly these bytes.
+
+    Returns True if the file was (re)written.
+    """
+    # Größenvergleich per stat() zuerst — der Bytevergleich läuft nur,
+    # wenn die Datei überhaupt gleich sein kann.
+    try:
+        if dest.stat().st_size == len(content) and dest.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    dest.write_bytes(content)
+    return True
+
+
 def _sync_via_git(cfg: Config) -> bool:
     """Try a quick `git pull` if we're inside the repo."""
     repo = _repo_root(cfg)
@@ -79,8 +95,10 @@ def _sync_via_api(cfg: Config) -> bool:
             data = resp.json()
             content = base64.b64decode(data["content"])
             dest = data_dir / _CACHE_FILES[key]
-            dest.write_bytes(content)
-            log.info("Fetched %s (%d bytes)", repo_path, len(content))
+            if _write_if_changed(dest, content):
+                log.info("Fetched %s (%d bytes)", repo_path, len(content))
+            else:
+                log.info("Fetched %s — unchanged, cache kept", repo_path)
         except Exception as exc:
             log.warning("API fetch failed for %s: %s", repo_path, exc)
             ok = False
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -27,6 +28,10 @@ logging.basicConfig(
 )
 log = logging.getLogger("live.main")
 
+# XR18 nur per Name erkennen — ein Regex-Scan pro Gerät statt mehrerer
+# lower()+Substring-Suchen
+_XR18_NAME_RE = re.compile(r"xr18|behringer", re.IGNORECASE)
+
 
 class _EventLogHandler(logging.Handler):
     """Leitet WARNING/ERROR/CRITICAL ins aktive Session-Logfile um."""
@@ -52,6 +57,11 @@ class _EventLogHandler(logging.Handler):
 # --- Global state ---
 cfg: Config = load_config()
 db: dict = {}
+# /api/songs-Antwort zum aktuellen db-Snapshot. db wird nur als Ganzes ersetzt
+# (startup, /api/sync), nie in-place geändert — Identität reicht als Schlüssel.
+_songs_cache: tuple[dict, dict] | None = None
+# song_id → nach bar_num sortierte Takte, gleicher Snapshot-Schlüssel
+_bars_by_song: tuple[dict, dict[str, list]] | None = None
 qlc_data: QlcData | None = None
 osc: QlcOsc | None = None
 ws_handler = WsHandler()
@@ -186,6 +196,9 @@ async def shutdown():
         if session_id and ref_db:
             await _export_and_push_probe_log(session_id)
 
+    if ref_db:
+        ref_db.close()
+
 
 async def _export_and_push_probe_log(session_id: str) -> None:
     """Exportiert Probe-Events als JSON und pusht nach GitHub."""
@@ -307,6 +320,10 @@ def _get_parts_for_song(song_id: str, song: dict, total_bars: int) -> dict:
 @app.get("/api/songs")
 async def get_songs():
     """Return all songs from the DB with parts from split_markers.part_starts."""
+    global _songs_cache
+    if _songs_cache is not None and _songs_cache[0] is db:
+        return _songs_cache[1]
+
     songs_db = db.get("songs", {})
     bars_db = db.get("bars", {})
 
@@ -329,9 +346,26 @@ async def get_songs():
             "parts": _get_parts_for_song(sid, s, bars_per_song.get(sid, 0)),
             "anchors": s.get("anchors", []),
         }
+    _songs_cache = (db, result)
     return result
 
 
+def _song_bars_index() -> dict[str, list]:
+    """Takte je Song, einmal pro db-Snapshot statt einmal pro Request gebaut."""
+    global _bars_by_song
+    if _bars_by_song is not None and _bars_by_song[0] is db:
+        return _bars_by_song[1]
+    index: dict[str, list] = {}
+    for b in db.get("bars", {}).values():
+        sid = b.get("song_id")
+        if sid:
+            index.setdefault(sid, []).append(b)
+    for bars in index.values():
+        bars.sort(key=lambda x: x.get("bar_num", 0))
+    _bars_by_song = (db, index)
+    return index
+
+
 @app.get("/api/songs/{song_id}/bars")
 async def get_song_bars(song_id: str):
     """Return bars for a song, grouped by parts if available.
@@ -343,16 +377,12 @@ async def get_song_bars(song_id: str):
     song = db.get("songs", {}).get(song_id)
     if not song:
         return JSONResponse({"error": "Song not found"}, status_code=404)
-    all_bars = db.get("bars", {})
-
     # Collect all bars for this song (current schema: bars have song_id)
-    song_bars = sorted(
-        [b for b in all_bars.values() if b.get("song_id") == song_id],
-        key=lambda x: x.get("bar_num", 0),
-    )
+    song_bars = _song_bars_index().get(song_id, [])
 
     # If no bars found via song_id, try legacy schema (part_id)
     if not song_bars:
+        all_bars = db.get("bars", {})
         parts = song.get("parts", {})
         if parts:
             bars_by_part: dict[str, list] = {}
@@ -545,11 +575,13 @@ async def get_audio_devices():
     from .audio.audio_process import AudioProcess
     devices = AudioProcess.list_devices()
     # XR18 nur per Name erkennen — Kanalzahl allein reicht nicht (andere Geräte/JACK haben auch 18+)
-    xr18_candidates = [d for d in devices if "xr18" in d.get("name", "").lower()
-                       or "behringer" in d.get("name", "").lower()]
-    other_18ch = [d for d in devices if d.get("channels_in", 0) >= 18
-                  and "xr18" not in d.get("name", "").lower()
-                  and "behringer" not in d.get("name", "").lower()]
+    xr18_candidates: list[dict] = []
+    other_18ch: list[dict] = []
+    for d in devices:
+        if _XR18_NAME_RE.search(d.get("name", "")):
+            xr18_candidates.append(d)
+        elif d.get("channels_in", 0) >= 18:
+            other_18ch.append(d)
     return {
         "devices": devices,
         "xr18_detected": len(xr18_candidates) > 0,
@@ -877,9 +909,10 @@ async def _handle_ws_action(action: str, msg: dict) -> dict | None:
         if qlc_data and ws_handler.state.current_song_id:
             chaser = qlc_data.song_mapping.get(ws_handler.state.current_song_id)
 
+        # Einmal normalisieren — beide Suchen vergleichen gegen pn
+        pn = part_name.lower()
         if chaser:
             # Passenden Chaser-Step per Part-Name suchen (normalisiert)
-            pn = part_name.lower()
             step_index = next(
                 (i for i, s in enumerate(chaser.steps) if (s.note or "").lower().strip() == pn),
                 None,
@@ -900,7 +933,7 @@ async def _handle_ws_action(action: str, msg: dict) -> dict | None:
         song = songs.get(ws_handler.state.current_song_id or "", {})
         tpl = next(
             (ps.get("light_template", "") for ps in song.get("split_markers", {}).get("part_starts", [])
-             if (ps.get("name", "") or "").lower().strip() == part_name.lower()),
+             if (ps.get("name", "") or "").lower().strip() == pn),
             "",
         )
         await ws_handler.update_state(current_part_name=part_name, is_playing=True)
@@ -6,7 +6,7 @@ import asyncio
 import json
 import logging
 import time
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, fields
 from typing import Any
 
 from fastapi import WebSocket
@@ -40,6 +40,11 @@ class LiveState:
         return asdict(self)
 
 
+# Gültige update_state()-Schlüssel — Mengen-Lookup statt hasattr() pro kwarg
+# (hasattr ließe außerdem Methoden wie to_dict durch).
+_STATE_FIELDS: frozenset[str] = frozenset(f.name for f in fields(LiveState))
+
+
 class WsHandler:
     """Manages WebSocket connections and live state."""
 
@@ -85,10 +90,11 @@ class WsHandler:
 
     async def update_state(self, **kwargs: Any) -> None:
         """Update state fields and broadcast."""
+        state = self.state
         changed = False
         for key, value in kwargs.items():
-            if hasattr(self.state, key) and getattr(self.state, key) != value:
-                setattr(self.state, key, value)
+            if key in _STATE_FIELDS and getattr(state, key) != value:
+                setattr(state, key, value)
                 changed = True
         if changed:
             await self.broadcast_state()
@@ -27,6 +27,7 @@ Der Segment-Offset (= start_t des SongSegment) wird separat gespeichert.
 
 from __future__ import annotations
 
+import bisect as _bisect
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -43,6 +44,10 @@ class BarMarker:
     quantize_failed: bool = False   # True → kein Beat/Snare in der Nähe gefunden (transient, nicht gespeichert)
 
 
+def _marker_t(m: BarMarker) -> float:
+    return m.t
+
+
 @dataclass
 class SongAnnotation:
     """Alle Takt-Annotationen für einen Song innerhalb einer Session."""
@@ -64,19 +69,16 @@ class SongAnnotation:
     ) -> BarMarker:
         """Fügt einen Takt-Marker bei Zeit *t* ein.
 
-        Hält die Liste nach *t* sortiert und nummeriert alle Marker danach neu.
+        Hält die Liste nach *t* sortiert und nummeriert die Marker ab der
+        Einfügeposition neu (die davor behalten ihre Nummer).
         *restart_bar_num* != None → Fragment-Start-Marker (setzt Zähler zurück).
         """
-        # Einfügeposition finden (sortiert nach t)
-        idx = len(self.markers)
-        for i, m in enumerate(self.markers):
-            if m.t > t:
-                idx = i
-                break
+        # Einfügeposition per Binärsuche (hinter gleichen t, wie bisher)
+        idx = _bisect.bisect_right(self.markers, t, key=_marker_t)
         marker = BarMarker(t=t, bar_num=0, part_name=part_name,
                            restart_bar_num=restart_bar_num)
         self.markers.insert(idx, marker)
-        self._renumber()
+        self._renumber(idx)
         return marker
 
     def remove_nearest(
@@ -92,7 +94,7 @@ class SongAnnotation:
                        key=lambda i: abs(self.markers[i].t - t))
         if abs(self.markers[best_idx].t - t) <= max_dist_sec:
             removed = self.markers.pop(best_idx)
-            self._renumber()
+            self._renumber(best_idx)
             return removed
         return None
 
@@ -110,9 +112,16 @@ class SongAnnotation:
             return None
         return min(self.markers, key=lambda m: abs(m.t - t))
 
-    def _renumber(self) -> None:
-        counter = self.start_bar_num
-        for m in self.markers:
+    def _renumber(self, start: int = 0) -> None:
+        """Nummeriert die Marker ab Index *start* neu.
+
+        Ein Einfügen/Entfernen ändert nur die Nummern dahinter — die Marker
+        davor sind bereits korrekt nummeriert und dienen als Startwert.
+        """
+        markers = self.markers
+        counter = markers[start - 1].bar_num + 1 if start > 0 else self.start_bar_num
+        for i in range(start, len(markers)):
+            m = markers[i]
             if m.restart_bar_num is not None:
                 counter = m.restart_bar_num
             m.bar_num = counter
@@ -27,6 +27,11 @@ import numpy as np
 import soundfile as sf
 
 
+def _fmt_t(t: float) -> str:
+    m, s = divmod(t, 60)
+    return f"{int(m)}:{s:04.1f}"
+
+
 @dataclass
 class Fragment:
     """A contiguous played section within a song segment."""
@@ -41,10 +46,7 @@ class Fragment:
 
     def fmt(self) -> str:
         """Human-readable time range string."""
-        def _fmt(t: float) -> str:
-            m, s = divmod(t, 60)
-            return f"{int(m)}:{s:04.1f}"
-        return f"{_fmt(self.start_t)}\u2013{_fmt(self.end_t)}"
+        return f"{_fmt_t(self.start_t)}\u2013{_fmt_t(self.end_t)}"
 
     def __repr__(self) -> str:
         return f"Fragment({self.fmt()}, {self.duration:.1f}s, drums={self.drum_ratio:.0%})"
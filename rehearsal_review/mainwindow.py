@@ -1,6 +1,7 @@
 """mainwindow.py — Main application window for Rehearsal Post-Preparation."""
 from __future__ import annotations
 
+import bisect as _bisect
 import json
 import math
 import os
@@ -10,19 +11,23 @@ import time
 from pathlib import Path
 from typing import Optional
 
-from PyQt6.QtCore import Qt, QSortFilterProxyModel, QThread, QTimer, pyqtSignal
-from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtCore import (
+    QAbstractListModel, QModelIndex, Qt, QSortFilterProxyModel, QThread, QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QAction, QFont, QKeySequence, QTextCursor
 from PyQt6.QtWidgets import (
     QApplication, QComboBox, QDialog, QFileDialog, QInputDialog,
-    QLabel, QListWidget, QListWidgetItem, QMainWindow, QMessageBox,
-    QProgressDialog, QPushButton, QScrollArea, QSpinBox, QStatusBar,
-    QToolBar, QVBoxLayout, QWidget,
+    QLabel, QListView, QMainWindow, QMessageBox,
+    QPlainTextEdit, QProgressDialog, QPushButton, QScrollArea, QSpinBox,
+    QSplitter, QStatusBar, QToolBar, QVBoxLayout, QWidget,
 )
 
 from session import Session, SongSegment, load_session
 from peaks import PeakWorker, DISPLAY_CHANNELS, TrackPeaks
 from player import AudioPlayer
 from timeline import TimelineWidget, CONTENT_H, LABEL_W, TRACKS
+from timefmt import fmt_mmss
 from overview import OverviewWidget
 from annotation import (
     BarMarker, SongAnnotation,
@@ -122,14 +127,14 @@ _ZOOM_PRESETS: list[int] = [2, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560, 512
 
 _PANEL_STYLE = """
 QDialog       { background:#0e1017; border:1px solid #1e2230; }
-QListWidget   { background:#0e1017; border:none; outline:none; }
-QListWidget::item {
+QListView     { background:#0e1017; border:none; outline:none; }
+QListView::item {
     padding:6px 12px;
     border-bottom:1px solid #1e2230;
     font-family:'DM Mono',monospace; font-size:10px; color:#a0a4b8;
 }
-QListWidget::item:selected { background:#00dc8218; color:#00dc82; }
-QListWidget::item:hover    { background:#1c1f2b; }
+QListView::item:selected { background:#00dc8218; color:#00dc82; }
+QListView::item:hover    { background:#1c1f2b; }
 QScrollBar:vertical        { background:#0e1017; width:6px; }
 QScrollBar::handle:vertical { background:#2a2e40; border-radius:3px; }
 QScrollBar::add-line:vertical,
@@ -148,7 +153,7 @@ _TYPE_ICONS = {
 
 def _fmt_event_row(ev, seg_start: float) -> str:
     """Return a single-line description for an event list row."""
-    t = _fmt_t(ev.t - seg_start)
+    t = fmt_mmss(ev.t - seg_start)
     et = ev.type
 
     if et == "beat":
@@ -218,6 +223,72 @@ def _fmt_event_row(ev, seg_start: float) -> str:
     return f"{t}   {et}  {pairs}" if pairs else f"{t}   {et}"
 
 
+class _EventListModel(QAbstractListModel):
+    """Virtuelles Listenmodell der Segment-Events.
+
+    Die View fragt data() nur für sichtbare Zeilen ab — Zeilentexte werden
+    erst beim ersten Anzeigen formatiert, Items pro Event gibt es nicht.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._events: list = []
+        self._seg_start: float = 0.0
+        self._texts: dict[int, str] = {}
+
+    def set_segment(self, seg: "SongSegment") -> None:
+        self.beginResetModel()
+        self._events = seg.events
+        self._seg_start = seg.start_t
+        self._texts = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._events)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        text = self._texts.get(row)
+        if text is None:
+            text = _fmt_event_row(self._events[row], self._seg_start)
+            self._texts[row] = text
+        return text
+
+    def t_in_segment(self, row: int) -> float:
+        return self._events[row].t - self._seg_start
+
+
+class _DbPartsModel(QAbstractListModel):
+    """Virtuelles Listenmodell der DB-Parts eines Songs (wie _EventListModel).
+
+    Nur sichtbare Zeilen werden formatiert; die View hält keine Items.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._parts: list[dict] = []
+
+    def set_parts(self, parts: list[dict]) -> None:
+        self.beginResetModel()
+        self._parts = parts
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._parts)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        part = self._parts[index.row()]
+        return (f"T{part['first_bar']:>3}–{part['last_bar']:<3}  "
+                f"({part['bar_count']} Takte)   {part['part_name']}")
+
+    def part(self, row: int) -> dict:
+        return self._parts[row]
+
+
 class EventListPanel(QDialog):
     """Non-modal floating panel showing all events for the active segment.
 
@@ -231,44 +302,91 @@ class EventListPanel(QDialog):
         self.resize(480, 520)
         self.setStyleSheet(_PANEL_STYLE)
 
-        self._list = QListWidget()
-        self._list.itemClicked.connect(self._on_item_clicked)
+        self._model = _EventListModel(self)
+        self._list = QListView()
+        self._list.setModel(self._model)
+        # Einzeilige Rows: Qt muss nicht jede Zeile vermessen, Layout/Scroll
+        # kostet dann nur noch die sichtbaren Zeilen statt alle Events.
+        self._list.setUniformItemSizes(True)
+        self._list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self._list.clicked.connect(self._on_row_clicked)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self._list)
 
-        self._seg_start: float = 0.0
+        self._seg: Optional["SongSegment"] = None
         self._event_times: list[float] = []
+        self._focused_row: int = -1
 
     def load_segment(self, seg: "SongSegment") -> None:
-        self._list.clear()
-        self._seg_start = seg.start_t
-        self._event_times = []
-        for ev in seg.events:
-            text = _fmt_event_row(ev, seg.start_t)
-            item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, ev.t - seg.start_t)
-            self._list.addItem(item)
-            self._event_times.append(ev.t)
+        # Segmente sind nach load_session() unveränderlich — derselbe Song
+        # (z.B. erneuter Klick aufs Event-Label) braucht keinen Neuaufbau.
+        if seg is self._seg:
+            return
+        self._seg = seg
+        self._event_times = [ev.t for ev in seg.events]
+        self._model.set_segment(seg)
+        self._focused_row = -1
 
     def focus_at(self, wav_t: float) -> None:
         """Scroll to and select the last event at or before wav_t."""
-        row = -1
-        for i, t in enumerate(self._event_times):
-            if t <= wav_t:
-                row = i
-            else:
-                break
-        if row >= 0:
-            self._list.setCurrentRow(row)
-            self._list.scrollToItem(
-                self._list.item(row),
-                QListWidget.ScrollHint.PositionAtCenter,
-            )
+        # Event-Zeiten sind sortiert — bisect statt linearem Scan pro Tick
+        row = _bisect.bisect_right(self._event_times, wav_t) - 1
+        # Läuft alle 40 ms mit — nur bei Zeilenwechsel selektieren/scrollen
+        if row >= 0 and row != self._focused_row:
+            self._focused_row = row
+            idx = self._model.index(row)
+            self._list.setCurrentIndex(idx)
+            self._list.scrollTo(idx, QListView.ScrollHint.PositionAtCenter)
+
+    def _on_row_clicked(self, index: QModelIndex) -> None:
+        self.seek_requested.emit(self._model.t_in_segment(index.row()))
+
+
+class _SessionLoadWorker(QThread):
+    """QThread that parses the session JSONL (load_session) off the main thread."""
+    finished = pyqtSignal(object)   # Session
+    error    = pyqtSignal(str)      # error message
 
-    def _on_item_clicked(self, item: QListWidgetItem) -> None:
-        t_in_seg: float = item.data(Qt.ItemDataRole.UserRole)
-        self.seek_requested.emit(t_in_seg)
+    def __init__(self, jsonl_path: Path, db: Optional[dict], parent=None) -> None:
+        super().__init__(parent)
+        self._jsonl_path = jsonl_path
+        self._db         = db
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(load_session(self._jsonl_path, self._db))
+        except Exception as exc:
+            self.error.emit(str(exc))
+
+
+class _AutosaveWorker(QThread):
+    """QThread that serialises and writes the annotation autosave file.
+
+    Built once per window and restarted per tick — set_snapshot() hands over
+    the next path/data before start().
+    """
+    finished = pyqtSignal()
+    error    = pyqtSignal(str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._path: Optional[Path] = None
+        self._data: dict = {}
+
+    def set_snapshot(self, path: Path, data: dict) -> None:
+        self._path = path
+        self._data = data
+
+    def run(self) -> None:
+        try:
+            self._path.write_text(
+                json.dumps(self._data, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            self.finished.emit()
+        except Exception as exc:
+            self.error.emit(str(exc))
 
 
 class _FragmentWorker(QThread):
@@ -365,6 +483,43 @@ class _ImportWorker(QThread):
             self.error.emit(str(exc))
 
 
+class _ChromaStoreWorker(QThread):
+    """QThread that maps simulator chroma beats to bars and stores them in reference.db."""
+    finished = pyqtSignal(int)   # number of bars stored
+    error    = pyqtSignal(str)   # error message
+
+    def __init__(self, ref_db_path, song_id, chroma_data, bar_times,
+                 parent=None) -> None:
+        super().__init__(parent)
+        self._ref_db_path = ref_db_path
+        self._song_id     = song_id
+        self._chroma_data = chroma_data
+        self._bar_times   = bar_times
+
+    def run(self) -> None:
+        try:
+            from detection.reference_db import ReferenceDB as _RDB
+
+            bars_sorted = sorted(self._bar_times)
+            bar_chromas: dict[int, list] = {}
+            for entry in self._chroma_data:
+                idx = _bisect.bisect_right(bars_sorted, entry["t"]) - 1
+                if idx >= 0:
+                    bar_chromas.setdefault(idx + 1, []).append(entry["chroma"])
+
+            rdb = _RDB(self._ref_db_path)
+            try:
+                n_stored = rdb.upsert_bar_chromas(self._song_id, {
+                    bn: _np.mean(chromas, axis=0).astype(_np.float32)
+                    for bn, chromas in bar_chromas.items()
+                })
+            finally:
+                rdb.close()
+            self.finished.emit(n_stored)
+        except Exception as exc:
+            self.error.emit(str(exc))
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -383,6 +538,10 @@ class MainWindow(QMainWindow):
         self._peak_worker: Optional[PeakWorker] = None
         self._progress: Optional[QProgressDialog] = None
         self._overview_worker: Optional[PeakWorker] = None
+        self._session_worker: Optional[_SessionLoadWorker] = None
+        self._autosave_worker: Optional[_AutosaveWorker] = None
+        # Session-Lade- und Chroma-Worker, auf die closeEvent warten muss
+        self._bg_workers: list[QThread] = []
         self._pending_seek_t: Optional[float] = None
 
         self._event_panel: Optional[EventListPanel] = None
@@ -392,6 +551,20 @@ class MainWindow(QMainWindow):
         self._annotation_mode: bool = False
         self._annot_dirty: bool = False
         self._base_window_title: str = f"Rehearsal Post-Preparation v{APP_VERSION} — lighting.ai"
+        # Logfile-Viewer: ein wiederverwendeter Dialog, Text je (Pfad, mtime, Größe)
+        self._log_dlg: Optional[QDialog] = None
+        self._log_edit = None
+        self._log_key: Optional[tuple] = None
+        self._log_lines: list[str] = []
+        # reference.db-Parts je song_id — ändern sich während einer Session nicht
+        self._db_parts_cache: dict[str, list[dict]] = {}
+        # DB-Parts-Dialog: einmal gebaut, Liste nur bei Songwechsel neu befüllt
+        self._db_parts_dlg: Optional[QDialog] = None
+        self._db_parts_model: Optional[_DbPartsModel] = None
+        self._db_parts_view: Optional[QListView] = None
+        self._db_parts_hint: Optional[QLabel] = None
+        self._db_parts_empty: Optional[QLabel] = None
+        self._db_parts_song: Optional[str] = None
 
         # Fragment detection results for the active segment
         self._detected_fragments: list = []
@@ -405,6 +578,9 @@ class MainWindow(QMainWindow):
         self._sim_t_in_seg:    float = 0.0  # Segment-relative Startposition für Seek
         self._sim_bpm:         float = 120.0
         self._sim_song_key:    str   = ""
+        # Anker-Status: sortierte Anker des laufenden Songs + Trefferzähler
+        self._sim_anchors_sorted: list = []
+        self._sim_anchor_count:   int  = 0
         self._last_bar_times:  list  = []
 
         # Autosave-Timer: speichert Annotierungen alle 90 s wenn dirty
@@ -412,6 +588,31 @@ class MainWindow(QMainWindow):
         self._autosave_timer.setInterval(90_000)
         self._autosave_timer.timeout.connect(self._autosave)
 
+        # Start-Takt-Spinbox entprellen: Tippen/Pfeil-Wiederholung erzeugt
+        # eine valueChanged-Salve — neu nummeriert wird erst nach der Pause.
+        self._start_bar_timer = QTimer(self)
+        self._start_bar_timer.setSingleShot(True)
+        self._start_bar_timer.setInterval(250)
+        self._start_bar_timer.timeout.connect(self._apply_start_bar)
+        self._pending_start_bar: tuple | None = None   # (annotation, value)
+
+        # Solo/Mute-Salven (mehrere Tracks schnell hintereinander) zu einem
+        # reload_mix zusammenfassen — jeder Reload stoppt/startet den Player.
+        self._mix_timer = QTimer(self)
+        self._mix_timer.setSingleShot(True)
+        self._mix_timer.setInterval(80)
+        self._mix_timer.timeout.connect(self._apply_solo_mix)
+        self._pending_soloed: frozenset | None = None
+
+        # Songwahl entprellen: Pfeiltasten/Mausrad im Song-Combo erzeugen eine
+        # currentIndexChanged-Salve, und jede Wahl bricht den Peak-Worker ab
+        # und startet ihn neu — geladen wird erst der zuletzt gewählte Song.
+        self._song_timer = QTimer(self)
+        self._song_timer.setSingleShot(True)
+        self._song_timer.setInterval(150)
+        self._song_timer.timeout.connect(self._apply_song_change)
+        self._pending_song_index: int = -1
+
         self._player = AudioPlayer(self)
         self._player.position_changed.connect(self._on_position)
         self._player.playback_stopped.connect(self._on_stopped)
@@ -460,6 +661,15 @@ class MainWindow(QMainWindow):
         self._pos_label.setStyleSheet(
             "font-family:'DM Mono',monospace; font-size:10px; color:#a0a4b8;"
         )
+        # Feste Breite für die längste Anzeige: setText() alle 40 ms ändert so
+        # nie den sizeHint, die Statusleiste muss nicht jedes Mal neu layouten.
+        self._pos_label.ensurePolished()
+        self._pos_label.setFixedWidth(
+            self._pos_label.fontMetrics().horizontalAdvance("000:00.00") + 4
+        )
+        self._pos_label.setAlignment(
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        )
         self._status.addPermanentWidget(self._pos_label)
         _ver_label = QLabel(f"v{APP_VERSION}")
         _ver_label.setStyleSheet(
@@ -564,6 +774,7 @@ class MainWindow(QMainWindow):
         )
         self._sim_btn.setCheckable(True)
         self._sim_btn.setChecked(False)
+        self._sim_btn.setStyleSheet(self._SIM_BTN_STYLE)
         self._sim_btn_set_running(False)
         self._sim_btn.clicked.connect(self._on_sim_btn_clicked)
         tb2.addWidget(self._sim_btn)
@@ -577,12 +788,13 @@ class MainWindow(QMainWindow):
         )
         self._annot_act.triggered.connect(self._on_toggle_annotation_mode)
 
-        tb2.addWidget(QLabel("  ab Takt "))
+        # Beschriftung als Spinbox-Präfix statt eigenem Platzhalter-QLabel;
+        # die Breite ergibt sich dann aus sizeHint (Präfix + "999").
         self._start_bar_spin = QSpinBox()
+        self._start_bar_spin.setPrefix("ab Takt ")
         self._start_bar_spin.setMinimum(1)
         self._start_bar_spin.setMaximum(999)
         self._start_bar_spin.setValue(1)
-        self._start_bar_spin.setFixedWidth(56)
         self._start_bar_spin.setToolTip(
             "Erster annotierter Takt entspricht diesem DB-Takt.\n"
             "Anpassen wenn die Aufnahme nicht bei Takt 1 des Songs beginnt."
@@ -645,7 +857,6 @@ class MainWindow(QMainWindow):
         default_dir = str(
             Path(__file__).parent.parent / "live" / "data" / "recordings"
         )
-        from PyQt6.QtWidgets import QSplitter
         dlg = QFileDialog(self, "Aufnahme öffnen", default_dir)
         dlg.setOptions(QFileDialog.Option.DontUseNativeDialog)
         dlg.setNameFilter("JSONL Event-Log (*.jsonl);;Alle Dateien (*)")
@@ -675,15 +886,40 @@ class MainWindow(QMainWindow):
                 self._load_session(Path(sel[0]))
 
     def _load_session(self, jsonl_path: Path) -> None:
+        # JSONL-Parsing im Hintergrund — lange Proben haben zehntausende
+        # Event-Zeilen, das würde die UI beim Öffnen sekundenlang einfrieren.
         db = self._try_load_db(jsonl_path)
-        try:
-            session = load_session(jsonl_path, db)
-        except Exception as exc:
-            QMessageBox.critical(self, "Fehler", str(exc))
+        worker = _SessionLoadWorker(jsonl_path, db, parent=self)
+        worker.finished.connect(
+            lambda session, w=worker: self._on_session_loaded(w, jsonl_path, session)
+        )
+        worker.error.connect(
+            lambda msg, w=worker: self._on_session_load_error(w, msg)
+        )
+        self._session_worker = worker
+        self._track_worker(worker)
+        self._status.showMessage(f"Lade {jsonl_path.name} …")
+        worker.start()
+
+    def _on_session_load_error(self, worker: _SessionLoadWorker, msg: str) -> None:
+        if worker is not self._session_worker:
             return
+        self._session_worker = None
+        self._status.clearMessage()
+        QMessageBox.critical(self, "Fehler", msg)
+
+    def _on_session_loaded(
+        self, worker: _SessionLoadWorker, jsonl_path: Path, session: Session,
+    ) -> None:
+        # Ergebnis eines inzwischen überholten Ladevorgangs verwerfen
+        if worker is not self._session_worker:
+            return
+        self._session_worker = None
 
         self._session = session
         self._current_seg = None
+        self._db_parts_cache.clear()
+        self._db_parts_song = None
         self._player.stop()
 
         # Load existing annotations for this session
@@ -703,8 +939,7 @@ class MainWindow(QMainWindow):
             )
             if reply == QMessageBox.StandardButton.Yes:
                 try:
-                    import json as _json
-                    data = _json.loads(autosave_path.read_text(encoding="utf-8"))
+                    data = json.loads(autosave_path.read_text(encoding="utf-8"))
                     self._annotations = {
                         k: SongAnnotation.from_dict(v) for k, v in data.items()
                     }
@@ -718,7 +953,9 @@ class MainWindow(QMainWindow):
         self._detect_frags_act.setEnabled(True)
         self._sim_btn.setEnabled(True)
 
-        # Fill song combo (block signals during rebuild)
+        # Fill song combo (block signals during rebuild) — eine noch
+        # entprellte Wahl aus der alten Session verwerfen
+        self._song_timer.stop()
         self._song_combo.blockSignals(True)
         self._song_combo.clear()
         for seg in session.songs:
@@ -728,7 +965,7 @@ class MainWindow(QMainWindow):
 
         # Pass recording start time to timeline ruler
         self._timeline.set_recording_started_at(
-            getattr(session, "recording_started_at", None)
+            session.recording_started_at
         )
 
         mix = " · Mixdown" if session.mixdown_path else ""
@@ -773,7 +1010,7 @@ class MainWindow(QMainWindow):
 
         # Select first song
         if self._song_combo.count():
-            self._song_combo.setCurrentIndex(0)
+            self._select_song(0)
 
     def _try_load_db(self, jsonl_path: Path) -> Optional[dict]:
         for p in [
@@ -782,7 +1019,7 @@ class MainWindow(QMainWindow):
         ]:
             if p.exists():
                 try:
-                    return json.loads(p.read_text("utf-8"))
+                    return _load_db_json(p)
                 except Exception:
                     pass
         return None
@@ -790,6 +1027,22 @@ class MainWindow(QMainWindow):
     # ── Song selection ────────────────────────────────────────────────────────
 
     def _on_song_combo_changed(self, index: int) -> None:
+        # Nur Benutzer-Wahlen landen hier entprellt — programmatische Wahlen
+        # gehen über _select_song() und werden sofort angewendet.
+        self._pending_song_index = index
+        self._song_timer.start()
+
+    def _select_song(self, index: int) -> None:
+        """Wählt einen Song programmatisch ohne Entprell-Verzögerung."""
+        self._song_timer.stop()
+        self._song_combo.blockSignals(True)
+        self._song_combo.setCurrentIndex(index)
+        self._song_combo.blockSignals(False)
+        self._pending_song_index = index
+        self._apply_song_change()
+
+    def _apply_song_change(self) -> None:
+        index = self._pending_song_index
         if index < 0:
             return
         seg: Optional[SongSegment] = self._song_combo.itemData(index)
@@ -856,19 +1109,21 @@ class MainWindow(QMainWindow):
             self._peak_worker.terminate()
             self._peak_worker.wait(300)
         if self._progress:
-            self._progress.close()
+            self._progress.reset()
 
         if self._session is None:
             return
 
-        self._progress = QProgressDialog(
-            f'Lade Wellenformen: "{seg.song_name}"...',
-            None, 0, 100, self
-        )
-        self._progress.setWindowTitle("Wellenformen")
-        self._progress.setWindowModality(Qt.WindowModality.WindowModal)
-        self._progress.setMinimumDuration(300)
-        self._progress.setCancelButton(None)
+        if self._progress is None:
+            # Einmal gebaut und pro Songwahl wiederverwendet — vorher blieb
+            # jeder geschlossene Dialog als Kind des Fensters liegen
+            self._progress = QProgressDialog("", None, 0, 100, self)
+            self._progress.setWindowTitle("Wellenformen")
+            self._progress.setWindowModality(Qt.WindowModality.WindowModal)
+            self._progress.setMinimumDuration(300)
+            self._progress.setCancelButton(None)
+        self._progress.setLabelText(f'Lade Wellenformen: "{seg.song_name}"...')
+        self._progress.setValue(0)
 
         worker = PeakWorker(
             wav_path=self._session.wav_path,
@@ -883,14 +1138,17 @@ class MainWindow(QMainWindow):
         prg = self._progress
         cur = seg
 
-        worker.progress.connect(lambda v: prg.setValue(v))
-        worker.finished.connect(lambda peaks: self._on_peaks_done(cur, peaks, prg))
-        worker.error.connect(lambda msg: self._on_peaks_error(msg, prg))
+        worker.progress.connect(prg.setValue)
+        worker.finished.connect(
+            lambda peaks: self._on_peaks_done(cur, peaks, prg, worker))
+        worker.error.connect(lambda msg: self._on_peaks_error(msg, prg, worker))
         worker.start()
 
     def _on_peaks_done(self, seg: SongSegment, peaks: TrackPeaks,
-                       prg: QProgressDialog) -> None:
-        prg.close()
+                       prg: QProgressDialog, worker: PeakWorker) -> None:
+        # Dialog ist geteilt: nur der aktuelle Worker schließt ihn
+        if worker is self._peak_worker:
+            prg.close()
         if self._current_seg is not seg:
             return
         self._timeline.set_peaks(peaks)
@@ -905,12 +1163,13 @@ class MainWindow(QMainWindow):
                 self._timeline.set_cursor(seg.start_t + t_in_seg)
                 self._overview.set_playhead(seg.start_t + t_in_seg)
 
-    def _on_peaks_error(self, msg: str, prg: QProgressDialog) -> None:
-        prg.close()
+    def _on_peaks_error(self, msg: str, prg: QProgressDialog,
+                        worker: PeakWorker) -> None:
+        if worker is self._peak_worker:
+            prg.close()
         # Erkenne typischen "kaputten RF64-Header"-Fehler aus libsndfile.
         low = msg.lower()
         if "fseek" in low or "unspecified internal error" in low:
-            from PyQt6.QtWidgets import QMessageBox
             wav_name = (
                 self._session.wav_path.name if self._session is not None else "?"
             )
@@ -959,9 +1218,17 @@ class MainWindow(QMainWindow):
         self._event_panel.raise_()
 
     def _on_solo_mute_changed(self, muted: frozenset, soloed: frozenset) -> None:
-        """Reload audio mix when Solo/Mute state changes."""
-        solo_chs = self._solo_to_channels(soloed)
-        self._player.reload_mix(solo_chs)
+        """Queue an audio mix reload; bursts of Solo/Mute changes collapse into one."""
+        self._pending_soloed = soloed
+        self._mix_timer.start()
+
+    def _apply_solo_mix(self) -> None:
+        """Reload audio mix for the latest queued Solo state."""
+        if self._pending_soloed is None:
+            return
+        soloed = self._pending_soloed
+        self._pending_soloed = None
+        self._player.reload_mix(self._solo_to_channels(soloed))
 
     def _solo_to_channels(self, soloed: frozenset) -> Optional[list[int]]:
         """Convert soloed track indices to raw WAV channel indices.
@@ -1036,17 +1303,16 @@ class MainWindow(QMainWindow):
             self._status.showMessage(f"Overview-Fehler: {msg}", 5000)
 
     def _on_overview_peaks_done(self, track_peaks) -> None:
-        import numpy as np
         chs = list(track_peaks.channel_peaks.values())
         if not chs:
             return
         # Mean RMS across all display channels → true composite activity waveform
-        all_max = np.stack([cp.peaks_max for cp in chs], axis=0)
-        all_min = np.stack([cp.peaks_min for cp in chs], axis=0)
-        pk_max = np.mean(all_max, axis=0)
-        pk_min = np.mean(all_min, axis=0)
+        all_max = _np.stack([cp.peaks_max for cp in chs], axis=0)
+        all_min = _np.stack([cp.peaks_min for cp in chs], axis=0)
+        pk_max = _np.mean(all_max, axis=0)
+        pk_min = _np.mean(all_min, axis=0)
         # Normalize to 95th-percentile so the waveform fills the display height
-        scale = float(np.percentile(pk_max, 95)) if len(pk_max) > 0 else 0.0
+        scale = float(_np.percentile(pk_max, 95)) if len(pk_max) > 0 else 0.0
         if scale > 1e-6:
             pk_max = pk_max / scale
             pk_min = pk_min / scale
@@ -1068,6 +1334,16 @@ class MainWindow(QMainWindow):
             return
 
         if target_seg is self._current_seg:
+            if self._song_timer.isActive():
+                # Klick im aktiven Song ist neuer als eine noch entprellte
+                # Combo-Wahl — diese verwerfen und das Combo zurückstellen
+                self._song_timer.stop()
+                for i in range(self._song_combo.count()):
+                    if self._song_combo.itemData(i) is target_seg:
+                        self._song_combo.blockSignals(True)
+                        self._song_combo.setCurrentIndex(i)
+                        self._song_combo.blockSignals(False)
+                        break
             t_in_seg = max(0.0, wav_t - target_seg.start_t)
             self._player.seek(t_in_seg)
             self._timeline.set_cursor(wav_t)
@@ -1076,7 +1352,7 @@ class MainWindow(QMainWindow):
             self._pending_seek_t = wav_t
             for i in range(self._song_combo.count()):
                 if self._song_combo.itemData(i) is target_seg:
-                    self._song_combo.setCurrentIndex(i)
+                    self._select_song(i)
                     break
 
     # ── Zoom ──────────────────────────────────────────────────────────────────
@@ -1104,22 +1380,25 @@ class MainWindow(QMainWindow):
         self._timeline.set_zoom(self._timeline.zoom * factor)
         self._sync_zoom_combo()
 
+    # Annotations-Tasten → Handler-Name; eine Tabelle statt if/elif pro Taste
+    _ANNOTATION_KEYS: dict = {
+        Qt.Key.Key_B: "_add_bar_marker",
+        Qt.Key.Key_P: "_add_part_marker",
+        Qt.Key.Key_F: "_add_fragment_marker",
+        Qt.Key.Key_U: "_undo_last_marker",
+    }
+
     def keyPressEvent(self, event) -> None:
-        if event.key() == Qt.Key.Key_Space:
+        key = event.key()
+        handler = self._ANNOTATION_KEYS.get(key)
+        if key == Qt.Key.Key_Space:
             if self._sim_worker is not None:
                 self._stop()   # Simulation + Audio sofort stoppen
             else:
                 self._toggle_play()
-        elif event.key() in (Qt.Key.Key_B, Qt.Key.Key_P, Qt.Key.Key_F, Qt.Key.Key_U):
+        elif handler is not None:
             if self._annotation_mode:
-                if event.key() == Qt.Key.Key_B:
-                    self._add_bar_marker()
-                elif event.key() == Qt.Key.Key_P:
-                    self._add_part_marker()
-                elif event.key() == Qt.Key.Key_F:
-                    self._add_fragment_marker()
-                else:
-                    self._undo_last_marker()
+                getattr(self, handler)()
             else:
                 self._status.showMessage(
                     "⚠  Annotationsmodus inaktiv — erst 'Annotieren' in der Toolbar einschalten",
@@ -1130,6 +1409,19 @@ class MainWindow(QMainWindow):
 
     # ── Annotation handlers ───────────────────────────────────────────────────
 
+    def _cached_db_parts(self, ref_db_path: Path, song_id: str) -> list[dict]:
+        """Parts eines Songs aus reference.db — pro Session nur einmal gelesen."""
+        parts = self._db_parts_cache.get(song_id)
+        if parts is None:
+            from detection.reference_db import ReferenceDB
+            rdb = ReferenceDB(ref_db_path)
+            try:
+                parts = rdb.get_parts_for_song(song_id)
+            finally:
+                rdb.close()
+            self._db_parts_cache[song_id] = parts
+        return parts
+
     def _show_db_parts(self) -> None:
         """Zeigt die Parts des aktuellen Songs aus der reference.db."""
         if self._current_seg is None:
@@ -1146,66 +1438,96 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            from detection.reference_db import ReferenceDB
-            ref_db = ReferenceDB(ref_db_path)
-            parts = ref_db.get_parts_for_song(self._current_seg.song_id)
+            parts = self._cached_db_parts(ref_db_path, self._current_seg.song_id)
         except Exception as exc:
             QMessageBox.critical(self, "DB-Parts", f"Fehler: {exc}")
             return
 
-        dlg = QDialog(self)
-        dlg.setWindowTitle(f"DB-Parts — {self._current_seg.song_name}")
-        dlg.setMinimumWidth(420)
-        dlg.setStyleSheet(_PANEL_STYLE + """
-            QDialog { background:#0e1017; }
-            QLabel  { color:#a0a4b8; font-family:'DM Mono',monospace; font-size:10px;
-                      padding:4px 8px; }
-        """)
-        layout = QVBoxLayout(dlg)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(4)
-
-        if not parts:
-            layout.addWidget(QLabel("Keine Parts in reference.db für diesen Song."))
-        else:
+        if self._db_parts_dlg is None:
+            dlg = QDialog(self)
+            dlg.setMinimumWidth(420)
+            dlg.setStyleSheet(_PANEL_STYLE + """
+                QDialog { background:#0e1017; }
+                QLabel  { color:#a0a4b8; font-family:'DM Mono',monospace; font-size:10px;
+                          padding:4px 8px; }
+            """)
+            layout = QVBoxLayout(dlg)
+            layout.setContentsMargins(8, 8, 8, 8)
+            layout.setSpacing(4)
+
+            empty = QLabel("Keine Parts in reference.db für diesen Song.")
+            layout.addWidget(empty)
             hint = QLabel("Doppelklick → Start-Takt setzen")
             hint.setStyleSheet("color:#5c6080; padding:2px 8px;")
             layout.addWidget(hint)
 
-            lst = QListWidget()
+            model = _DbPartsModel(dlg)
+            lst = QListView()
+            lst.setModel(model)
+            lst.setUniformItemSizes(True)
+            lst.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
             lst.setStyleSheet(_PANEL_STYLE)
-            for part in parts:
-                text = (f"T{part['first_bar']:>3}–{part['last_bar']:<3}  "
-                        f"({part['bar_count']} Takte)   {part['part_name']}")
-                lst.addItem(text)
             layout.addWidget(lst)
+            lst.doubleClicked.connect(self._on_db_part_double_clicked)
 
-            def on_double_click(item):
-                idx = lst.row(item)
-                first_bar = parts[idx]["first_bar"]
-                self._start_bar_spin.setValue(first_bar)
-                self._status.showMessage(
-                    f"Start-Takt auf {first_bar} gesetzt "
-                    f"({parts[idx]['part_name']})", 4000
-                )
-                dlg.accept()
+            self._db_parts_dlg, self._db_parts_model = dlg, model
+            self._db_parts_view = lst
+            self._db_parts_hint, self._db_parts_empty = hint, empty
+        dlg = self._db_parts_dlg
 
-            lst.itemDoubleClicked.connect(on_double_click)
+        song_id = self._current_seg.song_id
+        if song_id != self._db_parts_song:
+            self._db_parts_model.set_parts(parts)
+            self._db_parts_song = song_id
+        self._db_parts_empty.setVisible(not parts)
+        self._db_parts_hint.setVisible(bool(parts))
+        self._db_parts_view.setVisible(bool(parts))
 
+        dlg.setWindowTitle(f"DB-Parts — {self._current_seg.song_name}")
         dlg.exec()
 
+    def _on_db_part_double_clicked(self, index: QModelIndex) -> None:
+        """Start-Takt aus dem DB-Parts-Dialog übernehmen und Dialog schließen.
+
+        Part-Daten liefert das Modell per Zeile — keine Closure pro Dialog nötig.
+        """
+        part = self._db_parts_model.part(index.row())
+        first_bar = part["first_bar"]
+        self._start_bar_spin.setValue(first_bar)
+        self._status.showMessage(
+            f"Start-Takt auf {first_bar} gesetzt ({part['part_name']})", 4000
+        )
+        self._db_parts_dlg.accept()
+
     def _on_start_bar_changed(self, value: int) -> None:
-        """Setzt start_bar_num der aktuellen Annotation und nummeriert neu."""
+        """Merkt den neuen Start-Takt vor; angewendet wird entprellt."""
         ann = self._current_annotation()
         if ann is None:
             return
+        self._pending_start_bar = (ann, value)
+        self._start_bar_timer.start()
+
+    def _apply_start_bar(self) -> None:
+        """Setzt start_bar_num der vorgemerkten Annotation und nummeriert neu."""
+        if self._pending_start_bar is None:
+            return
+        ann, value = self._pending_start_bar
+        self._pending_start_bar = None
         ann.start_bar_num = value
         ann._renumber()
+        if ann is not self._current_annotation():
+            return   # Segment inzwischen gewechselt — nur Daten aktualisieren
         self._timeline.set_bar_markers(ann.markers)
         self._status.showMessage(
             f"Start-Takt auf {value} gesetzt — Marker neu nummeriert", 3000
         )
 
+    def _flush_start_bar(self) -> None:
+        """Wendet einen noch entprellten Start-Takt sofort an (vor Save/Import)."""
+        if self._start_bar_timer.isActive():
+            self._start_bar_timer.stop()
+            self._apply_start_bar()
+
     def _on_toggle_annotation_mode(self, checked: bool) -> None:
         self._annotation_mode = checked
         self._timeline.set_annotation_mode(checked)
@@ -1258,35 +1580,34 @@ class MainWindow(QMainWindow):
             return 0, 0
 
         # Beat-Zeiten aus Session-Events sammeln (relativ zum Segment-Start)
-        beat_times: list[float] = []
-        for ev in seg.events:
-            if ev.type in ("beat", "snare"):
-                beat_times.append(ev.t - seg.start_t)
-
-        if not beat_times:
+        beats = _np.sort(_np.fromiter(
+            (ev.t - seg.start_t for ev in seg.events if ev.type in ("beat", "snare")),
+            dtype=_np.float64,
+        ))
+        if beats.size == 0:
             return 0, 0
 
-        beat_times.sort()
-        win = self._QUANTIZE_WINDOW_SEC
-        n_snapped = 0
-        n_failed = 0
-
-        for m in ann.markers:
-            # Nächsten Beat in ±win suchen
-            best_t = None
-            best_dist = float("inf")
-            for bt in beat_times:
-                d = abs(bt - m.t)
-                if d <= win and d < best_dist:
-                    best_dist = d
-                    best_t = bt
-            if best_t is not None:
-                m.t = best_t
-                m.quantize_failed = False
-                n_snapped += 1
-            else:
-                m.quantize_failed = True
-                n_failed += 1
+        # Nächster Beat je Marker vektorisiert: linker/rechter Nachbar per
+        # searchsorted statt alle Beats pro Marker durchzugehen
+        markers = ann.markers
+        marker_t = _np.fromiter((m.t for m in markers), dtype=_np.float64,
+                                count=len(markers))
+        idx = _np.searchsorted(beats, marker_t)
+        left = beats[_np.maximum(idx - 1, 0)]
+        right = beats[_np.minimum(idx, beats.size - 1)]
+        d_left = _np.abs(left - marker_t)
+        d_right = _np.abs(right - marker_t)
+        # Bei Gleichstand gewinnt der frühere Beat (wie bei linearer Suche)
+        use_right = d_right < d_left
+        best_t = _np.where(use_right, right, left)
+        in_win = _np.where(use_right, d_right, d_left) <= self._QUANTIZE_WINDOW_SEC
+
+        for m, t, hit in zip(markers, best_t.tolist(), in_win.tolist()):
+            if hit:
+                m.t = t
+            m.quantize_failed = not hit
+        n_snapped = int(in_win.sum())
+        n_failed = len(markers) - n_snapped
 
         # Marker nach Snap neu sortieren und nummerieren
         ann.markers.sort(key=lambda m: m.t)
@@ -1319,19 +1640,20 @@ class MainWindow(QMainWindow):
         t_cursor = max(0.0, self.cursor_t_in_seg())
         estimated_bar = 1
         if ann and ann.markers:
-            before = [m for m in ann.markers if m.t <= t_cursor]
-            if before:
-                estimated_bar = before[-1].bar_num + 1
+            # Marker sind nach t sortiert — letzten Marker vor dem Cursor
+            # von hinten suchen statt eine Teilliste aufzubauen
+            last = next((m for m in reversed(ann.markers) if m.t <= t_cursor), None)
+            if last is not None:
+                estimated_bar = last.bar_num + 1
 
-        # Part-Namen aus reference.db laden
+        # Part-Namen aus reference.db laden (einmal je Song, dann aus dem Cache)
         db_parts: list[dict] = []
         try:
             if self._session:
                 candidate = self._session.wav_path.parent.parent / "reference.db"
                 if candidate.exists():
-                    from detection.reference_db import ReferenceDB
-                    db_parts = ReferenceDB(candidate).get_parts_for_song(
-                        self._current_seg.song_id
+                    db_parts = self._cached_db_parts(
+                        candidate, self._current_seg.song_id
                     )
         except Exception:
             pass
@@ -1393,8 +1715,8 @@ class MainWindow(QMainWindow):
         if ann is None or not ann.markers:
             self._status.showMessage("Keine Marker vorhanden", 2000)
             return
+        # Letzter Marker: die übrigen behalten ihre Nummern, kein Renumber
         removed = ann.markers.pop()
-        ann._renumber()
         self._timeline.set_bar_markers(ann.markers)
         self._mark_annotations_dirty()
         self._status.showMessage(
@@ -1430,22 +1752,48 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(self._base_window_title)
 
     def _autosave(self) -> None:
+        self._flush_start_bar()
         if not self._annot_dirty or self._session is None or not self._annotations:
             return
-        try:
-            autosave_path = self._session.jsonl_path.with_name(
-                self._session.jsonl_path.stem + "_annotations_autosave.json"
-            )
-            data = {k: v.to_dict() for k, v in self._annotations.items()}
-            autosave_path.write_text(
-                __import__("json").dumps(data, indent=2, ensure_ascii=False),
-                encoding="utf-8",
+        worker = self._autosave_worker
+        if worker is None:
+            # Ein Worker für die ganze Sitzung statt eines neuen QThread pro Tick
+            worker = _AutosaveWorker(parent=self)
+            worker.finished.connect(lambda: self._status.showMessage("Autosave ✓", 2000))
+            worker.error.connect(
+                lambda msg: self._status.showMessage(f"Autosave fehlgeschlagen: {msg}", 4000)
             )
-            self._status.showMessage("Autosave ✓", 2000)
-        except Exception as exc:
-            self._status.showMessage(f"Autosave fehlgeschlagen: {exc}", 4000)
+            self._autosave_worker = worker
+        elif worker.isRunning():
+            return   # vorheriger Schreibvorgang läuft noch — nächster Tick
+        autosave_path = self._session.jsonl_path.with_name(
+            self._session.jsonl_path.stem + "_annotations_autosave.json"
+        )
+        # Snapshot im GUI-Thread (to_dict() kopiert), JSON + Schreiben im Worker
+        worker.set_snapshot(
+            autosave_path, {k: v.to_dict() for k, v in self._annotations.items()}
+        )
+        worker.start()
+
+    def _track_worker(self, worker: QThread) -> None:
+        # Beendete Worker vergessen, den neuen für closeEvent merken
+        self._bg_workers = [w for w in self._bg_workers if w.isRunning()]
+        self._bg_workers.append(worker)
+
+    def closeEvent(self, event) -> None:
+        # Laufende Hintergrund-Threads abwarten — sonst bricht Qt beim
+        # Zerstören des Fensters mit "QThread: Destroyed while thread is
+        # still running" ab und Autosave-Datei bzw. SQLite-Transaktion
+        # bleiben halb geschrieben.
+        if self._autosave_worker is not None:
+            self._autosave_worker.wait()
+        for worker in self._bg_workers:
+            worker.wait()
+        self._bg_workers.clear()
+        super().closeEvent(event)
 
     def _save_annotations(self) -> None:
+        self._flush_start_bar()
         if self._session is None:
             return
         save_annotations(self._session.jsonl_path, self._annotations)
@@ -1458,6 +1806,7 @@ class MainWindow(QMainWindow):
 
     def _run_recording_import(self) -> None:
         """Startet den Feature-Import in einem Hintergrund-Thread."""
+        self._flush_start_bar()
         if self._session is None or not self._annotations:
             QMessageBox.information(
                 self, "Import", "Keine Annotierungen vorhanden."
@@ -1580,20 +1929,16 @@ class MainWindow(QMainWindow):
 
     # ── Simulation ────────────────────────────────────────────────────────────
 
-    _SIM_BTN_IDLE    = ("▶ Simulation",
-                        "border:2px solid #00dc82; background:transparent;"
-                        " color:#00dc82; padding:4px 10px; border-radius:3px;"
-                        " font-family:'DM Mono',monospace; font-size:10px;")
-    _SIM_BTN_RUNNING = ("■ Simulation",
-                        "border:2px solid #00dc82; background:#00dc82;"
-                        " color:#08090d; padding:4px 10px; border-radius:3px;"
-                        " font-family:'DM Mono',monospace; font-size:10px;"
-                        " font-weight:bold;")
+    # Läuft-Optik über :checked — Stylesheet einmal setzen, nicht bei jedem
+    # Umschalten neu parsen lassen.
+    _SIM_BTN_STYLE = ("QPushButton { border:2px solid #00dc82; background:transparent;"
+                      " color:#00dc82; padding:4px 10px; border-radius:3px;"
+                      " font-family:'DM Mono',monospace; font-size:10px; }"
+                      " QPushButton:checked { background:#00dc82; color:#08090d;"
+                      " font-weight:bold; }")
 
     def _sim_btn_set_running(self, running: bool) -> None:
-        text, style = self._SIM_BTN_RUNNING if running else self._SIM_BTN_IDLE
-        self._sim_btn.setText(text)
-        self._sim_btn.setStyleSheet(style)
+        self._sim_btn.setText("■ Simulation" if running else "▶ Simulation")
         self._sim_btn.setChecked(running)
 
     def _on_sim_btn_clicked(self) -> None:
@@ -1619,8 +1964,7 @@ class MainWindow(QMainWindow):
             repo_root = self._session.jsonl_path.parent.parent.parent.parent
             db_json   = repo_root / "db" / "lighting-ai-db.json"
             if db_json.exists():
-                import json as _json
-                db = _json.loads(db_json.read_text("utf-8"))
+                db = _load_db_json(db_json)
                 song_db       = db.get("songs", {}).get(seg.song_id, {})
                 bpm           = float(song_db.get("bpm", 120.0))
                 song_key      = song_db.get("key", "")
@@ -1677,23 +2021,10 @@ class MainWindow(QMainWindow):
         )
 
         # Anker-Erkennungs-Status in der Status-Bar anzeigen (läuft schnell durch)
-        start_t = sim_start_wav_t
-        _anchors_sorted = sorted(anchors, key=lambda a: (a.get("pos", 9999), a.get("bar_num", 0)))
-        _mc = [0]
-
-        def _on_anchor_status(anc, _mc=_mc, _al=_anchors_sorted, _st=start_t):
-            n = _mc[0] + 1
-            _mc[0] = n
-            nxt = _al[n] if n < len(_al) else None
-            nxt_str = (f"  → #{n+1}: [{nxt.get('type','')}] {nxt.get('event','')}"
-                       if nxt else "  ✓ alle erkannt")
-            self._status.showMessage(
-                f"⚓ #{n} [{anc.get('type','')}] {anc.get('event','')}  "
-                f"t={anc.get('t_detected', 0.0) - _st:.1f}s{nxt_str}",
-                15000,
-            )
-
-        worker.anchor_matched.connect(_on_anchor_status)
+        self._sim_anchors_sorted = sorted(
+            anchors, key=lambda a: (a.get("pos", 9999), a.get("bar_num", 0)))
+        self._sim_anchor_count = 0
+        worker.anchor_matched.connect(self._on_sim_anchor_matched)
 
         # Progress-Dialog
         self._sim_progress_dlg = QProgressDialog(
@@ -1703,10 +2034,7 @@ class MainWindow(QMainWindow):
         self._sim_progress_dlg.setWindowModality(Qt.WindowModality.WindowModal)
         self._sim_progress_dlg.setMinimumDuration(0)
         self._sim_progress_dlg.setValue(0)
-        worker.progress.connect(
-            lambda v: self._sim_progress_dlg.setValue(int(v * 100))
-            if self._sim_progress_dlg else None
-        )
+        worker.progress.connect(self._on_sim_progress)
         self._sim_progress_dlg.canceled.connect(self._stop)
 
         worker.finished.connect(self._on_sim_finished)
@@ -1714,6 +2042,23 @@ class MainWindow(QMainWindow):
         self._sim_worker = worker
         worker.start()
 
+    def _on_sim_anchor_matched(self, anc: dict) -> None:
+        n = self._sim_anchor_count + 1
+        self._sim_anchor_count = n
+        al = self._sim_anchors_sorted
+        nxt = al[n] if n < len(al) else None
+        nxt_str = (f"  → #{n+1}: [{nxt.get('type','')}] {nxt.get('event','')}"
+                   if nxt else "  ✓ alle erkannt")
+        self._status.showMessage(
+            f"⚓ #{n} [{anc.get('type','')}] {anc.get('event','')}  "
+            f"t={anc.get('t_detected', 0.0) - self._sim_start_wav_t:.1f}s{nxt_str}",
+            15000,
+        )
+
+    def _on_sim_progress(self, v: float) -> None:
+        if self._sim_progress_dlg is not None:
+            self._sim_progress_dlg.setValue(int(v * 100))
+
     def _close_sim_progress(self) -> None:
         if self._sim_progress_dlg is not None:
             self._sim_progress_dlg.close()
@@ -1727,7 +2072,6 @@ class MainWindow(QMainWindow):
         Liest das Audio direkt aus der WAV-Datei, wendet denselben 8kHz-HPF an
         wie der CrashDetector, und zeigt alle Entscheidungsgrößen in einem Dialog.
         """
-        import numpy as _np
         if self._session is None:
             return
 
@@ -1738,7 +2082,6 @@ class MainWindow(QMainWindow):
                 _CrashDetector, CH_SNARE, CH_OH_L, CH_OH_R, _make_filters,
             )
         except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Crash-Debug", f"Import-Fehler: {e}")
             return
 
@@ -1755,7 +2098,6 @@ class MainWindow(QMainWindow):
                 n_read  = int((t_end - t_start) * sr)
                 block   = f.read(n_read, dtype="float32", always_2d=True)
         except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Crash-Debug", f"WAV-Lesefehler: {e}")
             return
 
@@ -1852,12 +2194,10 @@ class MainWindow(QMainWindow):
             f"Zum Anpassen: detection/beat_detector.py, Klasse _CrashDetector"
         )
 
-        from PyQt6.QtWidgets import QMessageBox
-        from PyQt6.QtGui import QFont as _QFont
         dlg = QMessageBox(self)
         dlg.setWindowTitle("Crash-Debug")
         dlg.setText(msg)
-        dlg.setFont(_QFont("DM Mono", 10))
+        dlg.setFont(QFont("DM Mono", 10))
         dlg.exec()
 
     # ── Logfile-Viewer ─────────────────────────────────────────────────────────
@@ -1879,16 +2219,39 @@ class MainWindow(QMainWindow):
             )
             return
 
+        # Ein Viewer-Dialog für alle Aufrufe; Text nur neu laden, wenn sich
+        # das .log geändert hat (statt pro Rechtsklick Dialog + Volltext neu).
         try:
-            text = log_path.read_text(encoding="utf-8", errors="replace")
+            st = log_path.stat()
+            key = (log_path, st.st_mtime_ns, st.st_size)
+            if key != self._log_key:
+                text = log_path.read_text(encoding="utf-8", errors="replace")
+            else:
+                text = None
         except OSError as exc:
             QMessageBox.warning(self, "Logfile", f"Lesefehler: {exc}")
             return
 
+        if self._log_dlg is None:
+            dlg = QDialog(self)
+            dlg.resize(900, 600)
+            layout = QVBoxLayout(dlg)
+            edit = QPlainTextEdit()
+            edit.setReadOnly(True)
+            edit.setFont(QFont("DM Mono", 10))
+            edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+            layout.addWidget(edit)
+            self._log_dlg, self._log_edit = dlg, edit
+        dlg, edit = self._log_dlg, self._log_edit
+
+        if text is not None:
+            self._log_lines = text.splitlines()
+            edit.setPlainText(text)
+            self._log_key = key
+
         # Zielzeile bestimmen: letzte Zeile mit Timestamp ≤ wav_t.
-        lines = text.splitlines()
         target_line = 0
-        for i, ln in enumerate(lines):
+        for i, ln in enumerate(self._log_lines):
             m = self._LOG_TS_RE.match(ln)
             if m:
                 try:
@@ -1900,19 +2263,7 @@ class MainWindow(QMainWindow):
                 else:
                     break
 
-        from PyQt6.QtWidgets import QDialog, QPlainTextEdit, QVBoxLayout
-        from PyQt6.QtGui import QFont as _QFont, QTextCursor
-
-        dlg = QDialog(self)
         dlg.setWindowTitle(f"Logfile — {log_path.name}  @ t={wav_t:.2f}s")
-        dlg.resize(900, 600)
-        layout = QVBoxLayout(dlg)
-        edit = QPlainTextEdit()
-        edit.setReadOnly(True)
-        edit.setFont(_QFont("DM Mono", 10))
-        edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
-        edit.setPlainText(text)
-        layout.addWidget(edit)
 
         # Cursor auf Zielzeile setzen + zentriert sichtbar machen
         cursor = QTextCursor(edit.document().findBlockByNumber(target_line))
@@ -1930,9 +2281,6 @@ class MainWindow(QMainWindow):
         n_kicks   = result.get("n_kicks",   0)
         n_snares  = result.get("n_snares",  0)
         n_crashes = result.get("n_crashes", 0)
-        kicks     = result.get("kicks",   [])
-        snares    = result.get("snares",  [])
-        crashes   = result.get("crashes", [])
 
         if n_kicks == 0 and n_snares == 0:
             QMessageBox.warning(
@@ -1945,6 +2293,25 @@ class MainWindow(QMainWindow):
             )
             return
 
+        sim_bpm   = result.get("bpm", 0)
+        bpm_str   = f"  ~{sim_bpm} BPM" if sim_bpm > 0 else ""
+        crash_str = f"  | ★ {n_crashes} Crashes" if n_crashes > 0 else ""
+        self._status.showMessage(
+            f"Simulation: ◆ {n_kicks} Kicks (amber)  | ◆ {n_snares} Snares (cyan)"
+            f"{crash_str}{bpm_str}",
+            12000,
+        )
+
+        # Overlay erst im nächsten Event-Loop-Durchlauf befüllen: Progress-
+        # Dialog und Statuszeile sind dann schon neu gezeichnet, bevor die
+        # tausenden Sim-Events, Chroma- und Bass-Daten eingefügt werden.
+        QTimer.singleShot(0, lambda r=result: self._apply_sim_result(r))
+
+    def _apply_sim_result(self, result: dict) -> None:
+        kicks   = result.get("kicks",   [])
+        snares  = result.get("snares",  [])
+        crashes = result.get("crashes", [])
+
         # Overlay aktivieren und finales Ergebnis einfügen
         self._timeline.set_sim_overlay(True)
         self._timeline.clear_sim_beats()
@@ -1962,7 +2329,6 @@ class MainWindow(QMainWindow):
             self._timeline.add_sim_crash(self._sim_start_wav_t + t_c, e_c)
 
         # BPM-Timeline + Taktgitter (vom BarTracker im Simulator berechnet)
-        sim_bpm  = result.get("bpm", 0)
         bpm_tl   = _compute_bpm_timeline(abs_kicks, abs_snares)
         bar_times: list[float] = result.get("bar_times", [])
         self._timeline.set_sim_bpm_and_bars(bpm_tl, bar_times)
@@ -1980,45 +2346,27 @@ class MainWindow(QMainWindow):
         if vocal_data:
             self._timeline.set_vocal_data(vocal_data)
 
-        # Chroma-Werte in reference.db speichern (Beats → Takt-Nummern abbilden)
+        # Chroma-Werte in reference.db speichern (Beats → Takt-Nummern abbilden).
+        # Mittelung + SQLite-Schreiben im Hintergrund-Thread, damit die UI
+        # nach dem Simulationsende nicht blockiert.
         if chroma_data and bar_times and self._current_seg is not None:
-            try:
-                import bisect as _bisect
-                from detection.reference_db import ReferenceDB as _RDB
-
-                _rdb_path = None
-                if self._session:
-                    _cand = self._session.wav_path.parent.parent / "reference.db"
-                    if _cand.exists():
-                        _rdb_path = _cand
-                if _rdb_path is None:
-                    raise FileNotFoundError("reference.db nicht gefunden")
-
-                _rdb  = _RDB(_rdb_path)
-                _song = self._current_seg.song_id
-                _bars_sorted = sorted(bar_times)
-
-                _bar_chromas: dict[int, list] = {}
-                for entry in chroma_data:
-                    _idx = _bisect.bisect_right(_bars_sorted, entry["t"]) - 1
-                    if _idx >= 0:
-                        _bn = _idx + 1
-                        _bar_chromas.setdefault(_bn, []).append(entry["chroma"])
-
-                _n_stored = 0
-                for _bn, _chromas in _bar_chromas.items():
-                    _avg = _np.mean(_chromas, axis=0).astype(_np.float32)
-                    if _rdb.upsert_bar_chroma(_song, _bn, _avg):
-                        _n_stored += 1
-
-                if _n_stored > 0:
-                    self._status.showMessage(
-                        self._status.currentMessage()
-                        + f"  | ♪ {_n_stored} Chroma-Takte gespeichert",
-                        12000,
-                    )
-            except Exception as _ce:
-                print(f"[SIM] Chroma-Speicherung fehlgeschlagen: {_ce}", file=sys.stderr)
+            _rdb_path = None
+            if self._session:
+                _cand = self._session.wav_path.parent.parent / "reference.db"
+                if _cand.exists():
+                    _rdb_path = _cand
+            if _rdb_path is None:
+                print("[SIM] Chroma-Speicherung fehlgeschlagen: "
+                      "reference.db nicht gefunden", file=sys.stderr)
+            else:
+                worker = _ChromaStoreWorker(
+                    _rdb_path, self._current_seg.song_id,
+                    chroma_data, bar_times, parent=self,
+                )
+                worker.finished.connect(self._on_chroma_stored)
+                worker.error.connect(self._on_chroma_store_error)
+                self._track_worker(worker)
+                worker.start()
 
         n_chroma = len(chroma_data)
         n_bass   = len(bass_data)
@@ -2029,18 +2377,21 @@ class MainWindow(QMainWindow):
                 12000,
             )
 
-        bpm_str = f"  ~{sim_bpm} BPM" if sim_bpm > 0 else ""
-        crash_str = f"  | ★ {n_crashes} Crashes" if n_crashes > 0 else ""
-        self._status.showMessage(
-            f"Simulation: ◆ {n_kicks} Kicks (amber)  | ◆ {n_snares} Snares (cyan)"
-            f"{crash_str}{bpm_str}",
-            12000,
-        )
-
         # Zoom auf 80 px/s setzen für gut lesbare Diamond-Darstellung
         self._timeline.set_zoom(80.0)
         self._sync_zoom_combo()
 
+    def _on_chroma_stored(self, n_stored: int) -> None:
+        if n_stored > 0:
+            self._status.showMessage(
+                self._status.currentMessage()
+                + f"  | ♪ {n_stored} Chroma-Takte gespeichert",
+                12000,
+            )
+
+    def _on_chroma_store_error(self, err: str) -> None:
+        print(f"[SIM] Chroma-Speicherung fehlgeschlagen: {err}", file=sys.stderr)
+
     def _on_sim_error(self, err: str) -> None:
         self._close_sim_progress()
         self._sim_btn_set_running(False)
@@ -2061,15 +2412,29 @@ class MainWindow(QMainWindow):
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _fmt_t(secs: float) -> str:
-    m, s = divmod(int(secs), 60)
-    return f"{m}:{s:02d}"
+# Geparste lighting-ai-db.json je Pfad mit Datei-Stand — jeder Sim-Start und jedes
+# Session-Öffnen las und parste sonst die komplette Songdatenbank neu.
+# Aufrufer lesen nur, das dict darf nicht verändert werden.
+_DB_JSON_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def _load_db_json(path: Path) -> dict:
+    # (mtime_ns, size) wie beim .log-Viewer — float-mtime verpasst Änderungen
+    # innerhalb der Zeitstempel-Auflösung des Dateisystems
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _DB_JSON_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    db = json.loads(path.read_text("utf-8"))
+    _DB_JSON_CACHE[path] = (key, db)
+    return db
 
 
 def _fmt_t_precise(secs: float) -> str:
-    m = int(secs // 60)
-    s = secs % 60
-    return f"{m}:{s:05.2f}"
+    # Läuft bei jedem Player-Tick (40 ms) — eine divmod statt // und %
+    m, s = divmod(secs, 60)
+    return f"{int(m)}:{s:05.2f}"
 
 
 def _fmt_dur(secs: float) -> str:
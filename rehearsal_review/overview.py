@@ -97,6 +97,10 @@ class OverviewWidget(QWidget):
         old_px = self._cursor_px
         self._cursor_t = wav_t
         new_px = self._t_to_x(wav_t)
+        # Über die ganze Session ist 1 px mehrere Sekunden — meist bleibt der
+        # Cursor auf demselben Pixel, dann wäre jedes update() ein No-op-Repaint.
+        if new_px == old_px:
+            return
         self._cursor_px = new_px
         h = self.height()
         for px in (old_px, new_px):
@@ -148,7 +152,7 @@ class OverviewWidget(QWidget):
             return
 
         # ── Clock-time ruler — ticks only at full quarter hours (HH:00/15/30/45) ──
-        rec_start = getattr(self._session, "recording_started_at", None)
+        rec_start = self._session.recording_started_at
         dur = self._session.total_duration
         if dur > 0 and rec_start is not None:
             p.setFont(_FONT_RULE)
@@ -17,10 +17,29 @@ from typing import Optional
 
 import numpy as np
 import soundfile as sf
-import sounddevice as sd
 from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
 
 
+# sounddevice initialisiert PortAudio schon beim Import (Geräte-Scan über
+# ALSA/Pulse) — erst beim ersten play() laden, damit der Fensterstart nicht
+# darauf wartet und ohne Abspielen kein Audiogerät angefasst wird.
+_sd = None
+
+
+def _get_sd():
+    global _sd
+    if _sd is None:
+        import sounddevice
+        _sd = sounddevice
+    return _sd
+
+
+def _sd_stop() -> None:
+    # Vor dem ersten play() läuft nichts, was gestoppt werden müsste
+    if _sd is not None:
+        _sd.stop()
+
+
 # ── Background loader ─────────────────────────────────────────────────────────
 
 class RawLoader(QThread):
@@ -81,6 +100,9 @@ class AudioPlayer(QObject):
         self._play_ts: float = 0.0
         self._is_playing: bool = False
         self._seg_start_t: float = 0.0
+        # Beim play() vorberechnet, damit _tick nur eine Uhrzeit lesen muss
+        self._end_wav: float = 0.0     # WAV-Position des Segment-Endes
+        self._tick_base: float = 0.0   # WAV-Position minus monotonic() bei Start
 
         # Stored for reload_mix() and RawLoader
         self._wav_path: Optional[Path] = None
@@ -92,6 +114,9 @@ class AudioPlayer(QObject):
         self._raw: Optional[np.ndarray] = None
         self._n_ch_raw: int = 0
         self._raw_loader: Optional[RawLoader] = None
+        # Wiederverwendeter Solo-Mix-Puffer (N × 2) — bei jedem Solo/Mute-Klick
+        # denselben Speicher überschreiben statt das Segment neu zu allokieren
+        self._mix_buf: Optional[np.ndarray] = None
         self._load_gen: int = 0   # incremented each load_segment() call
 
         self._poll = QTimer(self)
@@ -123,6 +148,8 @@ class AudioPlayer(QObject):
         self._seg_end_raw = end_t
         self._raw = None
         self._n_ch_raw = 0
+        # Mix-Puffer gehört zum alten Segment — nicht über den Wechsel halten
+        self._mix_buf = None
 
         # Cancel any previous background loader
         if self._raw_loader and self._raw_loader.isRunning():
@@ -153,7 +180,7 @@ class AudioPlayer(QObject):
         was_playing = self._is_playing
 
         if was_playing:
-            sd.stop()
+            _sd_stop()
             self._poll.stop()
             self._is_playing = False
 
@@ -220,7 +247,10 @@ class AudioPlayer(QObject):
             self._data = self._raw[:, [ch_l, ch_r]]
         else:
             n = self._raw.shape[0]
-            stereo = np.zeros((n, 2), dtype=np.float32)
+            stereo = self._mix_buf
+            if stereo is None or stereo.shape[0] != n:
+                stereo = self._mix_buf = np.empty((n, 2), dtype=np.float32)
+            stereo.fill(0.0)
             for ch in solo_channels:
                 ch_idx = min(ch, self._n_ch_raw - 1)
                 mono = self._raw[:, ch_idx]
@@ -246,20 +276,23 @@ class AudioPlayer(QObject):
         if self._data is None:
             return
         try:
-            sd.play(self._data[self._start_frame:], self._sr,
-                    device="pulse", blocksize=4096)
+            _get_sd().play(self._data[self._start_frame:], self._sr,
+                           device="pulse", blocksize=4096)
         except Exception as exc:
             self.error.emit(str(exc))
             self._is_playing = False
             return
         self._play_ts = time.monotonic()
+        self._end_wav = self._seg_start_t + len(self._data) / self._sr
+        self._tick_base = (self._seg_start_t + self._start_frame / self._sr
+                           - self._play_ts)
         self._is_playing = True
         self._poll.start()
 
     def pause(self) -> None:
         if not self._is_playing:
             return
-        sd.stop()
+        _sd_stop()
         elapsed_frames = int((time.monotonic() - self._play_ts) * self._sr)
         self._start_frame = min(
             len(self._data) - 1,
@@ -272,7 +305,7 @@ class AudioPlayer(QObject):
         """Seek to seconds relative to segment start."""
         was = self._is_playing
         if was:
-            sd.stop()
+            _sd_stop()
             self._poll.stop()
         self._start_frame = max(0, int(t_in_segment * self._sr))
         if self._data is not None:
@@ -281,7 +314,7 @@ class AudioPlayer(QObject):
             self.play()
 
     def stop(self) -> None:
-        sd.stop()
+        _sd_stop()
         self._is_playing = False
         self._start_frame = 0
         self._poll.stop()
@@ -311,14 +344,15 @@ class AudioPlayer(QObject):
     # ── Internal ─────────────────────────────────────────────────────────────
 
     def _tick(self) -> None:
+        # Ein einziger Uhrzeit-Read pro Tick für Ende-Erkennung und Position
         if self._data is None:
             return
-        pos = self.position_in_segment
-        if pos >= len(self._data) / self._sr:
-            sd.stop()
+        pos_wav = self._tick_base + time.monotonic()
+        if pos_wav >= self._end_wav:
+            _sd_stop()
             self._is_playing = False
             self._start_frame = 0
             self._poll.stop()
             self.playback_stopped.emit()
             return
-        self.position_changed.emit(self.position_in_wav)
+        self.position_changed.emit(pos_wav)
@@ -5,6 +5,7 @@ Splits the recording into SongSegments based on select_song events.
 """
 from __future__ import annotations
 
+import bisect as _bisect
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -12,14 +13,15 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+# slots: eine Session hat zehntausende Events — kein __dict__ pro Instanz
+@dataclass(slots=True)
 class SessionEvent:
     t: float           # seconds since recording start
     type: str
     data: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class SongSegment:
     song_id: str
     song_name: str
@@ -123,10 +125,18 @@ def load_session(jsonl_path: Path, db: Optional[dict] = None) -> Session:
                 name = db["songs"][sid].get("name", name)
             selects.append((ev.t, sid, name))
 
+    # Segmentgrenzen per bisect über die nach t sortierten Events statt
+    # pro Song alle Events zu filtern (O(S·log N + K) statt O(S·N)).
+    # sorted() ist stabil und bei der ohnehin zeitlich geordneten JSONL O(N).
+    by_t = sorted(events, key=lambda e: e.t)
+    times = [e.t for e in by_t]
+
     songs: list[SongSegment] = []
     for i, (start_t, sid, name) in enumerate(selects):
         end_t = selects[i + 1][0] if i + 1 < len(selects) else total_duration
-        seg_events = [e for e in events if start_t <= e.t < end_t]
+        lo = _bisect.bisect_left(times, start_t)
+        hi = _bisect.bisect_left(times, end_t, lo)
+        seg_events = by_t[lo:hi]
         songs.append(SongSegment(
             song_id=sid,
             song_name=name,
@@ -5,10 +5,12 @@ in Echtzeit während die Simulation läuft. Spielt gleichzeitig Audio ab.
 """
 from __future__ import annotations
 
+import bisect as _bisect
+import json as _json
 import time
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QPoint, QRect, QSize, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QEvent, QPoint, QRect, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import (
     QPainter, QPen, QBrush, QColor, QFont, QPolygon,
 )
@@ -17,6 +19,8 @@ from PyQt6.QtWidgets import (
     QSizePolicy, QVBoxLayout, QWidget, QToolTip,
 )
 
+from timefmt import fmt_mmss
+
 # ── Farben ────────────────────────────────────────────────────────────────────
 C_BG      = QColor("#08090d")
 C_BG2     = QColor("#0e1017")
@@ -35,6 +39,8 @@ FONT_MONO  = QFont("DM Mono", 8)
 FONT_LABEL = QFont("Sora", 9)
 FONT_TINY  = QFont("DM Mono", 7)
 
+_BAR_PEN = QPen(C_WHITE, 1)
+
 # ── Anker-Typ-Farben (entspricht Live-App Badge-Farben) ───────────────────────
 _ANCHOR_COLORS: dict[str, QColor] = {
     "pete":          QColor("#38bdf8"),  # cyan
@@ -70,6 +76,10 @@ _y = 0
 for _r in _ROWS:
     _ROW_Y.append(_y)
     _y += _r["h"]
+_ROWS_BOTTOM = _y
+
+# Zeilen-Index per key — statt next(enumerate(...)) bei jedem paintEvent
+_ROW_IDX: dict[str, int] = {r["key"]: i for i, r in enumerate(_ROWS)}
 
 
 def _diamond(cx: int, cy: int, r: int = D_R) -> QPolygon:
@@ -81,6 +91,10 @@ def _diamond(cx: int, cy: int, r: int = D_R) -> QPolygon:
     ])
 
 
+def _bar_t(bar: tuple[int, float]) -> float:
+    return bar[1]
+
+
 # ── Canvas Widget ─────────────────────────────────────────────────────────────
 
 class SimCanvas(QWidget):
@@ -91,6 +105,8 @@ class SimCanvas(QWidget):
         self._scroll_x: int = 0
         self._max_t: float = 0.0
 
+        # Alle drei Listen wachsen zeitlich aufsteigend (Simulation läuft vorwärts)
+        # → paintEvent zeichnet per bisect nur das sichtbare Fenster.
         self._kicks:  list[float] = []
         self._snares: list[float] = []
         self._bars:   list[tuple[int, float]] = []   # (bar_num, t_rel)
@@ -101,7 +117,6 @@ class SimCanvas(QWidget):
 
         self._playhead_t: float = -1.0
 
-        self.setMouseTracking(True)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.setMinimumHeight(_TOTAL_H)
         self.setMaximumHeight(_TOTAL_H)
@@ -181,49 +196,60 @@ class SimCanvas(QWidget):
             p.setPen(C_BORDER)
             p.drawLine(0, y + row["h"] - 1, w, y + row["h"] - 1)
 
+        t_lo, t_hi = self._visible_range(ox)
+
         # ── Kicks ──────────────────────────────────────────────────────────────
-        ri = next(i for i, r in enumerate(_ROWS) if r["key"] == "kick")
+        ri = _ROW_IDX["kick"]
         y0, h = _ROW_Y[ri], _ROWS[ri]["h"]
         cy = y0 + h // 2
         p.setBrush(QBrush(C_AMBER))
         p.setPen(Qt.PenStyle.NoPen)
-        for t in self._kicks:
+        kicks = self._kicks
+        for t in kicks[_bisect.bisect_left(kicks, t_lo):_bisect.bisect_right(kicks, t_hi)]:
             x = self._x(t, ox)
             if self._in_view(x):
                 p.drawPolygon(_diamond(x, cy))
 
         # ── Snares ─────────────────────────────────────────────────────────────
-        ri = next(i for i, r in enumerate(_ROWS) if r["key"] == "snare")
+        ri = _ROW_IDX["snare"]
         y0, h = _ROW_Y[ri], _ROWS[ri]["h"]
         cy = y0 + h // 2
         p.setBrush(QBrush(C_CYAN))
         p.setPen(Qt.PenStyle.NoPen)
-        for t in self._snares:
+        snares = self._snares
+        for t in snares[_bisect.bisect_left(snares, t_lo):_bisect.bisect_right(snares, t_hi)]:
             x = self._x(t, ox)
             if self._in_view(x):
                 p.drawPolygon(_diamond(x, cy))
 
         # ── Takte ──────────────────────────────────────────────────────────────
-        ri = next(i for i, r in enumerate(_ROWS) if r["key"] == "bar")
+        ri = _ROW_IDX["bar"]
         y0, h = _ROW_Y[ri], _ROWS[ri]["h"]
         p.setFont(FONT_TINY)
-        for bar_num, t in self._bars:
-            x = self._x(t, ox)
-            if not self._in_view(x):
-                continue
-            p.setPen(QPen(C_WHITE, 1))
-            p.setOpacity(0.35)
+        bars = self._bars
+        b_lo = _bisect.bisect_left(bars, t_lo, key=_bar_t)
+        b_hi = _bisect.bisect_right(bars, t_hi, key=_bar_t)
+        visible_bars = [
+            (bar_num, x) for bar_num, t in bars[b_lo:b_hi]
+            if self._in_view(x := self._x(t, ox))
+        ]
+        # Zwei Durchgänge statt Pen/Opacity-Wechsel pro Takt:
+        # erst alle Linien (ein Pen, eine Opacity), dann die Nummern.
+        p.setPen(_BAR_PEN)
+        p.setOpacity(0.35)
+        for _, x in visible_bars:
             p.drawLine(x, y0, x, y0 + h - 2)
-            p.setOpacity(1.0)
+        p.setOpacity(1.0)
+        p.setPen(C_T2)
+        for bar_num, x in visible_bars:
             # Taktnummer: immer bei 1, danach jede 4. Takt
             if bar_num == 1 or bar_num % 4 == 1:
-                p.setPen(C_T2)
                 p.drawText(x + 2, y0, 28, h,
                            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
                            str(bar_num))
 
         # ── Anker ──────────────────────────────────────────────────────────────
-        ri = next(i for i, r in enumerate(_ROWS) if r["key"] == "anchor")
+        ri = _ROW_IDX["anchor"]
         y0, h = _ROW_Y[ri], _ROWS[ri]["h"]
         cy_d = y0 + 14   # diamond y
         p.setFont(FONT_TINY)
@@ -279,6 +305,12 @@ class SimCanvas(QWidget):
                        Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
                        row["label"])
 
+    def _visible_range(self, ox: int) -> tuple[float, float]:
+        """Sichtbares Zeitfenster (mit 1 px Rand; _in_view prüft exakt)."""
+        t_lo = (ox - 1) / PPS
+        t_hi = (ox + self.width() - LABEL_W + 1) / PPS
+        return t_lo, t_hi
+
     def _x(self, t: float, ox: int) -> int:
         return LABEL_W + int(t * PPS) - ox
 
@@ -287,53 +319,48 @@ class SimCanvas(QWidget):
 
     # ── Tooltip ───────────────────────────────────────────────────────────────
 
-    def mouseMoveEvent(self, ev) -> None:
-        mx = int(ev.position().x())
-        my = int(ev.position().y())
+    def event(self, ev) -> bool:
+        # Qt meldet ToolTip erst, wenn die Maus ruht — kein Mouse-Tracking
+        # und keine Python-Arbeit bei jeder Mausbewegung nötig
+        if ev.type() == QEvent.Type.ToolTip:
+            tip = self._tip_at(ev.pos().x(), ev.pos().y())
+            if tip:
+                QToolTip.showText(ev.globalPos(), tip, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(ev)
+
+    def _tip_at(self, mx: int, my: int) -> str:
         if mx < LABEL_W:
-            QToolTip.hideText()
-            return
+            return ""
 
         t_cursor = (mx - LABEL_W + self._scroll_x) / PPS
         TOL_T    = 0.15   # ±150 ms
 
-        for i, row in enumerate(_ROWS):
-            if _ROW_Y[i] <= my < _ROW_Y[i] + row["h"]:
-                key = row["key"]
-                if key == "kick":
-                    nearest = self._nearest(self._kicks, t_cursor, TOL_T)
-                    if nearest is not None:
-                        QToolTip.showText(
-                            ev.globalPosition().toPoint(),
-                            f"Kick  t={nearest:.3f}s", self)
-                    else:
-                        QToolTip.hideText()
-                elif key == "snare":
-                    nearest = self._nearest(self._snares, t_cursor, TOL_T)
-                    if nearest is not None:
-                        QToolTip.showText(
-                            ev.globalPosition().toPoint(),
-                            f"Snare  t={nearest:.3f}s", self)
-                    else:
-                        QToolTip.hideText()
-                elif key == "anchor":
-                    hit = None
-                    for anc in self._anchors_info:
-                        if abs(anc["t_expected"] - t_cursor) <= TOL_T * 2:
-                            hit = anc
-                    if hit:
-                        matched = hit["id"] in self._matched_ids
-                        st = "✓ erkannt" if matched else "wartend …"
-                        QToolTip.showText(
-                            ev.globalPosition().toPoint(),
-                            f"T{hit['bar_num']}  {hit.get('type','').upper()}: "
-                            f"{hit.get('event','')}  [{st}]", self)
-                    else:
-                        QToolTip.hideText()
-                else:
-                    QToolTip.hideText()
-                return
-        QToolTip.hideText()
+        # Zeile direkt per bisect über die Zeilen-Oberkanten bestimmen
+        if not 0 <= my < _ROWS_BOTTOM:
+            return ""
+        key = _ROWS[_bisect.bisect_right(_ROW_Y, my) - 1]["key"]
+        if key == "kick":
+            nearest = self._nearest(self._kicks, t_cursor, TOL_T)
+            if nearest is not None:
+                return f"Kick  t={nearest:.3f}s"
+        elif key == "snare":
+            nearest = self._nearest(self._snares, t_cursor, TOL_T)
+            if nearest is not None:
+                return f"Snare  t={nearest:.3f}s"
+        elif key == "anchor":
+            hit = None
+            for anc in self._anchors_info:
+                if abs(anc["t_expected"] - t_cursor) <= TOL_T * 2:
+                    hit = anc
+            if hit:
+                matched = hit["id"] in self._matched_ids
+                st = "✓ erkannt" if matched else "wartend …"
+                return (f"T{hit['bar_num']}  {hit.get('type','').upper()}: "
+                        f"{hit.get('event','')}  [{st}]")
+        return ""
 
     def _nearest(self, pool: list[float], t: float, tol: float):
         matches = [x for x in pool if abs(x - t) <= tol]
@@ -399,6 +426,7 @@ class SimMonitorDialog(QDialog):
         self._current_bpm = initial_bpm
         self._wall_start  = 0.0
         self._seg_dur     = 0.0   # Segment-Länge in Sekunden (für Anzeige)
+        self._seg_dur_str = "0:00"   # einmal je start_realtime formatiert
         self._auto_scroll = True
 
         # Playhead-Timer (läuft nur im Echtzeit-Modus)
@@ -464,6 +492,7 @@ class SimMonitorDialog(QDialog):
         """Startet den Playhead-Timer für Echtzeit-Modus."""
         self._is_running = True
         self._seg_dur    = seg_dur
+        self._seg_dur_str = fmt_mmss(seg_dur)
         self._wall_start = time.monotonic()
         self._cancel_btn.setText("⏹ Stoppen")
         self._cancel_btn.setEnabled(True)
@@ -545,8 +574,6 @@ class SimMonitorDialog(QDialog):
 
     def load_jsonl(self, path: Path) -> None:
         """Lädt alle Events aus einer fertigen Simulations-JSONL."""
-        import json as _json
-
         kicks:  list[float] = []
         snares: list[float] = []
         song_name = ""
@@ -593,16 +620,15 @@ class SimMonitorDialog(QDialog):
     # ── Interne Aktualisierungen ──────────────────────────────────────────────
 
     def _on_playhead_tick(self) -> None:
+        # 25 fps: Gesamtdauer ist in start_realtime vorformatiert, die
+        # laufende Zeit kommt aus dem gemeinsamen m:ss-Cache (je Sekunde
+        # nur einmal formatiert statt 25× divmod + f-String).
         elapsed = time.monotonic() - self._wall_start
         self._canvas.set_playhead(elapsed)
-        mins = int(elapsed) // 60
-        secs = int(elapsed) % 60
-        total_mins = int(self._seg_dur) // 60
-        total_secs = int(self._seg_dur) % 60
         self._info_lbl.setText(
             f"◆ {self._n_kicks}K  ◆ {self._n_snares}S  "
             f"⚓ {self._n_matched}/{self._n_anchors}  "
-            f"{mins}:{secs:02d} / {total_mins}:{total_secs:02d}"
+            f"{fmt_mmss(elapsed)} / {self._seg_dur_str}"
         )
         self._update_scroll(playhead_focused=True)
 
@@ -651,4 +677,7 @@ class SimMonitorDialog(QDialog):
 
     def resizeEvent(self, ev) -> None:
         super().resizeEvent(ev)
-        self._update_scroll()
+        # Scrollbereich hängt nur von der Breite ab — reine Höhenänderungen
+        # (Splitter, Layout-Durchläufe) brauchen keine Neuberechnung
+        if ev.size().width() != ev.oldSize().width():
+            self._update_scroll()
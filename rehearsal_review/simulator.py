@@ -227,6 +227,9 @@ class SimulatorWorker(QThread):
                 },
             }) + "\n")
 
+            # Schleifeninvariante einmal vorab statt pro Block/Event
+            seg_start = self._seg_start_t
+
             frames_done = 0
             while frames_done < seg_frames and not self.isInterruptionRequested():
                 read_n = min(BLOCK_SIZE, seg_frames - frames_done)
@@ -236,6 +239,8 @@ class SimulatorWorker(QThread):
                 frames_done += block.shape[0]
 
                 t_mid = blocks_done * BLOCK_SIZE / sr + (block.shape[0] / 2) / sr
+                # Absolute Zeit einmal pro Block (vorher pro Event neu berechnet)
+                t_abs = seg_start + t_mid
 
                 # ── Streaming Feature-Extraktoren befüllen ────────────────────
                 # Zuerst befüllen, dann Onset-Detection: der Buffer enthält das
@@ -255,8 +260,6 @@ class SimulatorWorker(QThread):
 
                 # ── Onset-Detection + BarTracker (streaming) ─────────────────
                 for ev in detector.process_block(block):
-                    t_abs = self._seg_start_t + t_mid
-
                     energy_f = float(ev.energy)
 
                     if ev.type == "kick":
@@ -303,9 +306,9 @@ class SimulatorWorker(QThread):
                 # ── Neue Takte prüfen → Bass-Chroma extrahieren ───────────────
                 current_bars = tracker.get_latest_bars()
                 bpm_now = tracker.get_bpm() or self._bpm
-                for i, bar_t in enumerate(current_bars):
-                    if i < _last_n_bars:
-                        continue
+                # Nur die seit dem letzten Block hinzugekommenen Takte
+                for i in range(_last_n_bars, len(current_bars)):
+                    bar_t = current_bars[i]
                     bar_num = i + 1
                     bass_chroma = bass_extractor.get_chroma()
                     bass_rhythm = bass_extractor.get_rhythm_score(self._bpm)
@@ -315,18 +318,18 @@ class SimulatorWorker(QThread):
                             "chroma": bass_chroma,
                             "rhythm": bass_rhythm,
                         })
-                    self.bar_detected.emit(bar_num, bar_t - self._seg_start_t, bpm_now)
+                    self.bar_detected.emit(bar_num, bar_t - seg_start, bpm_now)
                 _last_n_bars = len(current_bars)
 
                 # ── AnchorMatcher: RMS-basierte Trigger (Einsatz/Pause) ────────
                 if matcher and not matcher.done:
-                    _m = matcher.process_block(block, self._seg_start_t + t_mid)
+                    _m = matcher.process_block(block, t_abs)
                     if _m:
                         self.anchor_matched.emit(_m)
 
                 # ── BandActivityDetector ───────────────────────────────────────
-                for ev_type, ev_t in band_detector.process_block(block, self._seg_start_t + t_mid):
-                    self.band_event_detected.emit(ev_type, ev_t - self._seg_start_t)
+                for ev_type, ev_t in band_detector.process_block(block, t_abs):
+                    self.band_event_detected.emit(ev_type, ev_t - seg_start)
 
                 blocks_done += 1
                 if blocks_done % 50 == 0:
@@ -0,0 +1,20 @@
+"""timefmt.py — Gemeinsame Zeit-Formatierung für Timeline, Hauptfenster und Sim-Monitor.
+
+Ohne Qt-Abhängigkeit, damit auch Module ohne Timeline-Widget sie nutzen können.
+"""
+from __future__ import annotations
+
+
+# m:ss je ganzer Sekunde — Ruler, Event-Labels und Sim-Uhr formatieren bei
+# jedem Repaint/Tick (auch bei jedem Cursor-Tick) dieselben Werte neu
+_MMSS_LABELS: dict[int, str] = {}
+
+
+def fmt_mmss(secs: float) -> str:
+    """Sekunden → "m:ss" (abgerundet auf ganze Sekunden, gecacht)."""
+    key = int(secs)
+    txt = _MMSS_LABELS.get(key)
+    if txt is None:
+        m, s = divmod(key, 60)
+        txt = _MMSS_LABELS[key] = f"{m}:{s:02d}"
+    return txt
@@ -11,12 +11,13 @@ Label column right portion contains per-track M (mute) and S (solo) buttons.
 """
 from __future__ import annotations
 
+import bisect as _bisect
 import math
 from datetime import datetime, timedelta
 from typing import Optional
 
 import numpy as np
-from PyQt6.QtCore import Qt, QPoint, QRect, pyqtSignal
+from PyQt6.QtCore import Qt, QEvent, QPoint, QRect, pyqtSignal
 from PyQt6.QtGui import (
     QPainter, QPen, QBrush, QColor, QFont, QPolygon,
 )
@@ -25,6 +26,8 @@ from PyQt6.QtWidgets import QWidget, QScrollBar, QSizePolicy, QToolTip
 from session import SongSegment
 from peaks import TrackPeaks, CHANNEL_LABELS, SUM_CHANNELS, DISPLAY_CHANNELS
 from annotation import BarMarker
+from chroma_viz import chroma_to_rgb, chroma_shape_type, chroma_tooltip
+from timefmt import fmt_mmss
 
 # ── Layout ────────────────────────────────────────────────────────────────────
 LABEL_W   = 196
@@ -68,6 +71,9 @@ FONT_LABEL = QFont("Sora", 9)
 FONT_TIME  = QFont("DM Mono", 9)
 FONT_BTN   = QFont("DM Mono", 7)
 
+# Links/vertikal zentriert — einmal kombinieren statt pro drawText im Paint-Pfad
+ALIGN_LV = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
 # ── Per-track event markers ───────────────────────────────────────────────────
 # Channels that get ALL beat markers (◆ for every beat)
 BEAT_MARKER_CHS: frozenset[int] = frozenset({13, 14})   # OH L, OH R
@@ -78,6 +84,37 @@ KICK_MARKER_CHS: frozenset[int] = frozenset({8})         # Kick
 
 _DIAMOND_R = 4   # half-size of diamond marker (pixels)
 
+
+def _diamond(cx: int, cy: int, r: int = _DIAMOND_R) -> QPolygon:
+    return QPolygon([
+        QPoint(cx,     cy - r),
+        QPoint(cx + r, cy    ),
+        QPoint(cx,     cy + r),
+        QPoint(cx - r, cy    ),
+    ])
+
+
+def _draw_diamond(p: QPainter, ex: int, cy: int, color: QColor,
+                  alpha: int = 180, radius: int = _DIAMOND_R) -> None:
+    """Filled diamond with solid outline, fill at the given alpha."""
+    fill = QColor(color)
+    fill.setAlpha(alpha)
+    p.setPen(QPen(color, 1))
+    p.setBrush(QBrush(fill))
+    p.drawPolygon(_diamond(ex, cy, radius))
+
+
+# ── User-action labels ────────────────────────────────────────────────────────
+# Events-header label for the last user action before the cursor
+_USER_ACTION_LABELS: dict[str, str] = {
+    "next": "→ next", "prev": "← prev", "goto": "goto",
+    "select_song": "song", "send_template": "tmpl", "accent": "★",
+}
+# Short marks drawn in the events strip (other actions are not drawn)
+_USER_ACTION_MARKS: dict[str, str] = {
+    "next": "->", "prev": "<-", "goto": "~>", "accent": "*",
+}
+
 # ── Track definitions (in display order) ─────────────────────────────────────
 # Main L+R entfernt — die Overview-Zeile oben zeigt dieselbe Hüllkurve (CH 16+17)
 
@@ -143,6 +180,29 @@ _ANCHOR_COLORS: dict[str, QColor] = {
     "other":         QColor("#a0a4b8"),
 }
 
+
+def _anchor_shades(base: QColor) -> tuple[QColor, QColor, QColor]:
+    """(Ring α80, Kern/Label α200, unerkannt α70) einer Anker-Farbe."""
+    shades = []
+    for alpha in (80, 200, 70):
+        c = QColor(base)
+        c.setAlpha(alpha)
+        shades.append(c)
+    return tuple(shades)
+
+
+# Einmal vorberechnet statt drei QColor-Kopien pro Anker und Frame
+_ANCHOR_SHADES: dict[str, tuple[QColor, QColor, QColor]] = {
+    k: _anchor_shades(c) for k, c in _ANCHOR_COLORS.items()
+}
+_ANCHOR_SHADES_DEFAULT = _anchor_shades(C_T3)
+
+# Sim-Taktgitter: Pen/Farben einmal statt pro paintEvent bzw. pro Takt
+_SIM_BAR_PEN = QPen(QColor(255, 255, 255, 110), 1)
+_C_SIM_NUM   = QColor(0xee, 0xf0, 0xf6, 230)   # fast weiß, gut lesbar
+_C_SIM_BPM   = QColor(0xee, 0xf0, 0xf6, 240)   # helles Weiß
+_C_LABEL_BG  = QColor(0, 0, 0, 160)
+
 # Pre-compute y offsets — ANCHOR_H sits between Events strip and first Track
 _y = RULER_H + EVENTS_H + ANNOT_H + ANCHOR_H
 TRACK_Y: list[int] = []
@@ -152,10 +212,38 @@ for _t in TRACKS:
 
 CONTENT_H: int = _y + SCROLL_H
 
+# Track-Index je Label (erster Treffer) und Drum-Zeilen — TRACKS ist statisch,
+# Paint/Tooltip müssen die Liste nicht jedes Mal linear durchsuchen
+_TRACK_IDX: dict[str, int] = {}
+for _i, _t in enumerate(TRACKS):
+    _TRACK_IDX.setdefault(_t["label"], _i)
+_DRUM_LABELS = {"Kick", "Snare", "Toms", "OH L+R"}
+_DRUM_IDX: list[int] = [i for i, t in enumerate(TRACKS) if t["label"] in _DRUM_LABELS]
+
+
+# Fünfeck-Ecken auf dem Einheitskreis, Spitze oben
+_PENTAGON_UNIT = [
+    (math.cos(-math.pi / 2 + 2 * math.pi * i / 5),
+     math.sin(-math.pi / 2 + 2 * math.pi * i / 5))
+    for i in range(5)
+]
+
 
-def _fmt_t(secs: float) -> str:
-    m, s = divmod(int(secs), 60)
-    return f"{m}:{s:02d}"
+def _chroma_alpha(_entry: dict) -> int:
+    return 220
+
+
+def _bass_alpha(entry: dict) -> int:
+    # 40 (unregelmäßig) … 220 (perfekte 8tel)
+    return max(40, int(40 + float(entry.get("rhythm", 0.5)) * 180))
+
+
+def _track_at(y: int) -> int:
+    """Index des Tracks unter y (Binärsuche über TRACK_Y), -1 in Lücken/außerhalb."""
+    i = _bisect.bisect_right(TRACK_Y, y) - 1
+    if i >= 0 and y < TRACK_Y[i] + TRACKS[i]["h"]:
+        return i
+    return -1
 
 
 def _first_quarter_hour(dt: datetime) -> datetime:
@@ -190,11 +278,18 @@ class TimelineWidget(QWidget):
     # Rechtsklick auf Events-Strip → Logfile an dieser Stelle öffnen
     log_open_requested = pyqtSignal(float)            # absolute WAV time
 
+    # CRASH_RMS_MIN des Detektors, beim ersten Crash-Tooltip gelesen
+    _crash_rms_min: Optional[float] = None
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.segment: Optional[SongSegment] = None
         self.peaks: Optional[TrackPeaks] = None
         self.cursor_t: float = 0.0      # seconds in WAV
+        # Events-Zelle: Zeiten fürs bisect + (Index, Text, Farbe) des zuletzt
+        # gezeichneten Events — Label nur neu bauen, wenn das Event wechselt
+        self._ev_times: list[float] = []
+        self._ev_label_cache: Optional[tuple[int, str, QColor]] = None
 
         self._pps: float = 80.0         # pixels per second
         self._scroll_x: int = 0
@@ -234,6 +329,10 @@ class TimelineWidget(QWidget):
 
         # Vocal-VAD pro 50ms-Fenster — {t, active, rms}
         self._vocal_data: list[dict] = []
+        # Dieselben Fenster als parallele Spalten (gleicher Index), damit
+        # paintEvent nicht bei jedem Frame über die Dicts iterieren muss
+        self._vocal_ts:     list[float] = []
+        self._vocal_active: list[bool]  = []
 
         # Overlay-Modus: wenn True, JSONL-Events bei 25 % Opazität,
         # Sim-Events in vollen AMBER/CYAN-Farben (wie JSONL-Events).
@@ -254,7 +353,8 @@ class TimelineWidget(QWidget):
 
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setMinimumHeight(CONTENT_H)
-        self.setMouseTracking(True)
+        # Kein MouseTracking: Marker-Tooltips kommen über Qts ToolTip-Event
+        # (erst wenn die Maus ruht) statt bei jeder Mausbewegung.
 
     # ── Public API ────────────────────────────────────────────────────────────
 
@@ -263,6 +363,8 @@ class TimelineWidget(QWidget):
 
     def set_segment(self, seg: SongSegment, peaks: Optional[TrackPeaks] = None) -> None:
         self.segment = seg
+        self._ev_times = [ev.t for ev in seg.events]
+        self._ev_label_cache = None
         self.peaks = peaks
         self.cursor_t = seg.start_t
         self._scroll_x = 0
@@ -373,6 +475,8 @@ class TimelineWidget(QWidget):
         self._chroma_data      = []
         self._bass_data        = []
         self._vocal_data       = []
+        self._vocal_ts         = []
+        self._vocal_active     = []
         self._sim_anchors.clear()
         self._sim_matched_ids.clear()
         self._event_cursor_t   = -1.0
@@ -442,6 +546,8 @@ class TimelineWidget(QWidget):
     def set_vocal_data(self, data: list[dict]) -> None:
         """Setzt Vocal-VAD-Daten (Liste von {t, active, rms}) für den Lead-Vocal-Track."""
         self._vocal_data = data
+        self._vocal_ts = [e["t"] for e in data]
+        self._vocal_active = [bool(e["active"]) for e in data]
         self.update()
 
     def set_sim_bpm_and_bars(
@@ -462,36 +568,50 @@ class TimelineWidget(QWidget):
     # ── Solo / Mute ───────────────────────────────────────────────────────────
 
     def _toggle_mute(self, idx: int) -> None:
+        dim_before = [self._is_dim(i) for i in range(len(TRACKS))]
         if idx in self._muted:
             self._muted.discard(idx)
         else:
             self._muted.add(idx)
             self._soloed.discard(idx)
-        self.update()
+        self._update_track_rows(idx, dim_before)
         self.solo_mute_changed.emit(frozenset(self._muted), frozenset(self._soloed))
 
     def _toggle_solo(self, idx: int) -> None:
+        dim_before = [self._is_dim(i) for i in range(len(TRACKS))]
         if idx in self._soloed:
             self._soloed.discard(idx)
         else:
             self._soloed.add(idx)
             self._muted.discard(idx)
-        self.update()
+        self._update_track_rows(idx, dim_before)
         self.solo_mute_changed.emit(frozenset(self._muted), frozenset(self._soloed))
 
+    def _update_track_rows(self, idx: int, dim_before: list[bool]) -> None:
+        """Nur die Zeile mit dem geklickten Button und Zeilen mit geänderter
+        Dimmung neu zeichnen — nicht die ganze Timeline."""
+        w = self.width()
+        for i, was_dim in enumerate(dim_before):
+            if i == idx or self._is_dim(i) != was_dim:
+                self.update(QRect(0, TRACK_Y[i], w, TRACKS[i]["h"]))
+
     def _current_event_label(self) -> tuple[str, QColor]:
         """Return (short text, color) for the last event before cursor_t."""
         if not self.segment or not self.segment.events:
             return "EVENTS  ▸", C_T3
-        last = None
-        for ev in self.segment.events:
-            if ev.t <= self.cursor_t:
-                last = ev
-            else:
-                break
-        if last is None:
+        idx = _bisect.bisect_right(self._ev_times, self.cursor_t) - 1
+        if idx < 0:
             return "EVENTS  ▸", C_T3
-        t_rel = _fmt_t(last.t - self.segment.start_t)
+        cache = self._ev_label_cache
+        if cache is not None and cache[0] == idx:
+            return cache[1], cache[2]
+        text, color = self._event_label_for(self.segment.events[idx])
+        self._ev_label_cache = (idx, text, color)
+        return text, color
+
+    def _event_label_for(self, last) -> tuple[str, QColor]:
+        """Return (short text, color) describing one event of the segment."""
+        t_rel = fmt_mmss(last.t - self.segment.start_t)
         etype = last.type
         if etype == "beat":
             sym = "↓" if last.data.get("is_downbeat") else "·"
@@ -501,10 +621,7 @@ class TimelineWidget(QWidget):
             return f"{t_rel} {part}", C_CYAN
         if etype == "user":
             action = last.data.get("action", "?")
-            lmap = {"next": "→ next", "prev": "← prev", "goto": "goto",
-                    "select_song": "song", "send_template": "tmpl",
-                    "accent": "★"}
-            return f"{t_rel} {lmap.get(action, action)}", C_GREEN
+            return f"{t_rel} {_USER_ACTION_LABELS.get(action, action)}", C_GREEN
         if etype in ("session_start", "session_end"):
             return f"{t_rel} {etype}", C_T3
         return f"{t_rel} {etype}", C_T3
@@ -537,6 +654,15 @@ class TimelineWidget(QWidget):
 
     # ── Marker helpers ────────────────────────────────────────────────────────
 
+    @classmethod
+    def _crash_threshold(cls) -> float:
+        if cls._crash_rms_min is None:
+            # Lokaler Import: die Timeline lädt das detection-Paket nicht mit.
+            # Sim-Crashes stammen aus dem Detektor, er ist hier also vorhanden.
+            from detection.beat_detector import _CrashDetector
+            cls._crash_rms_min = _CrashDetector.CRASH_RMS_MIN
+        return cls._crash_rms_min
+
     @staticmethod
     def _marker_color_for(ev, track_chs: frozenset) -> Optional[QColor]:
         """Return the marker color for *ev* on a track with *track_chs*, or None."""
@@ -603,16 +729,15 @@ class TimelineWidget(QWidget):
                 self.event_label_clicked.emit(self.cursor_t)
                 return
             # S/M button clicks
-            for i, (track, ty) in enumerate(zip(TRACKS, TRACK_Y)):
-                th = track["h"]
-                if ty <= y < ty + th:
-                    btn_y = ty + (th - BTN_H) // 2
-                    if btn_y <= y < btn_y + BTN_H:
-                        if BTN_M_X <= x < BTN_M_X + BTN_W:
-                            self._toggle_mute(i)
-                        elif BTN_S_X <= x < BTN_S_X + BTN_W:
-                            self._toggle_solo(i)
-                    break
+            i = _track_at(y)
+            if i >= 0:
+                ty = TRACK_Y[i]
+                btn_y = ty + (TRACKS[i]["h"] - BTN_H) // 2
+                if btn_y <= y < btn_y + BTN_H:
+                    if BTN_M_X <= x < BTN_M_X + BTN_W:
+                        self._toggle_mute(i)
+                    elif BTN_S_X <= x < BTN_S_X + BTN_W:
+                        self._toggle_solo(i)
             return
 
         # Events-Strip: Rechtsklick öffnet das .log an dieser Stelle
@@ -637,7 +762,7 @@ class TimelineWidget(QWidget):
 
         # Rechtsklick auf OH L+R Track → Crash-Debug-Dialog
         if event.button() == Qt.MouseButton.RightButton and self.segment and x >= LABEL_W:
-            oh_idx = next((i for i, t in enumerate(TRACKS) if t["label"] == "OH L+R"), None)
+            oh_idx = _TRACK_IDX.get("OH L+R")
             if oh_idx is not None:
                 oh_ty = TRACK_Y[oh_idx]
                 oh_th = TRACKS[oh_idx]["h"]
@@ -652,13 +777,27 @@ class TimelineWidget(QWidget):
             t = max(0.0, min(t, self.segment.duration))
             self.seek_requested.emit(t)
 
-    def mouseMoveEvent(self, event) -> None:
-        x = int(event.position().x())
-        y = int(event.position().y())
+    # ── Tooltip / ToolTip event ───────────────────────────────────────────────
 
-        if x <= LABEL_W or self.segment is None:
+    def event(self, ev) -> bool:
+        if ev.type() == QEvent.Type.ToolTip:
+            pos = ev.pos()
+            tip = (self._marker_tip_at(pos) or self._chroma_tip_at(pos)
+                   or self._bass_tip_at(pos))
+            if tip:
+                QToolTip.showText(ev.globalPos(), tip, self)
+                return True
             QToolTip.hideText()
-            return
+            return True
+        return super().event(ev)
+
+    def _marker_tip_at(self, pos) -> str:
+        """Tooltip-Text für Sim-Crash bzw. Event-Marker unter der Maus."""
+        x = pos.x()
+        y = pos.y()
+
+        if x <= LABEL_W or self.segment is None:
+            return ""
 
         seg = self.segment
         pps = self._pps
@@ -668,7 +807,7 @@ class TimelineWidget(QWidget):
 
         # ── Sim-Crash-Tooltip auf OH L+R Row ──────────────────────────────────
         if self._sim_overlay and self._sim_crashes:
-            oh_idx = next((i for i, t in enumerate(TRACKS) if t["label"] == "OH L+R"), None)
+            oh_idx = _TRACK_IDX.get("OH L+R")
             if oh_idx is not None:
                 oh_ty = TRACK_Y[oh_idx]
                 oh_th = TRACKS[oh_idx]["h"]
@@ -679,66 +818,45 @@ class TimelineWidget(QWidget):
                             ex = LABEL_W + int((t_c - seg.start_t) * pps) - ox
                             if abs(ex - x) <= crash_r:
                                 # Confidence: RMS relativ zu CRASH_RMS_MIN
-                                try:
-                                    from detection.beat_detector import _CrashDetector
-                                    thresh = _CrashDetector.CRASH_RMS_MIN
-                                except Exception:
-                                    thresh = 0.025
+                                thresh = self._crash_threshold()
                                 conf_pct = min(100, int(e_c / max(thresh, 1e-9) * 50))
                                 t_rel = t_c - seg.start_t
                                 m, s = divmod(t_rel, 60)
                                 ts = f"{int(m)}:{s:05.2f}"
-                                tip = (f"Crash  {ts}\n"
-                                       f"RMS {e_c:.3f}  |  "
-                                       f"Erkennungssicherheit ~{conf_pct} %")
-                                QToolTip.showText(event.globalPosition().toPoint(), tip, self)
-                                return
-
-        for track, ty in zip(TRACKS, TRACK_Y):
+                                return (f"Crash  {ts}\n"
+                                        f"RMS {e_c:.3f}  |  "
+                                        f"Erkennungssicherheit ~{conf_pct} %")
+
+        ti = _track_at(y)
+        if ti >= 0:
+            track = TRACKS[ti]
+            ty = TRACK_Y[ti]
             th = track["h"]
-            if not (ty <= y < ty + th):
-                continue
             track_chs = self._track_chs_for(track)
             cy = ty + th - 2 - _DIAMOND_R   # diamond center y (bottom of track)
-            if abs(y - cy) > hit_r:
-                break
-            for ev in seg.events:
-                ex = LABEL_W + int((ev.t - seg.start_t) * pps) - ox
-                if abs(ex - x) > hit_r:
-                    continue
-                color = self._marker_color_for(ev, track_chs)
-                if color is None:
-                    continue
-                tip = self._build_marker_tooltip(ev, ev.t - seg.start_t)
-                QToolTip.showText(event.globalPosition().toPoint(), tip, self)
-                return
-            break
-
-        QToolTip.hideText()
-
-    # ── Tooltip / ToolTip event ───────────────────────────────────────────────
+            if abs(y - cy) <= hit_r:
+                # Nur Events im Zeitfenster ±hit_r (1 px Reserve für int()) prüfen
+                t_x = seg.start_t + (x - LABEL_W + ox) / pps
+                t_r = (hit_r + 1) / pps
+                lo = _bisect.bisect_left(self._ev_times, t_x - t_r)
+                hi = _bisect.bisect_right(self._ev_times, t_x + t_r, lo)
+                for ev in seg.events[lo:hi]:
+                    ex = LABEL_W + int((ev.t - seg.start_t) * pps) - ox
+                    if abs(ex - x) > hit_r:
+                        continue
+                    color = self._marker_color_for(ev, track_chs)
+                    if color is None:
+                        continue
+                    return self._build_marker_tooltip(ev, ev.t - seg.start_t)
 
-    def event(self, ev) -> bool:
-        from PyQt6.QtCore import QEvent
-        if ev.type() == QEvent.Type.ToolTip:
-            pos = ev.pos()
-            tip = self._chroma_tip_at(pos) or self._bass_tip_at(pos)
-            if tip:
-                QToolTip.showText(ev.globalPos(), tip, self)
-                return True
-            QToolTip.hideText()
-            return True
-        return super().event(ev)
+        return ""
 
     def _chroma_tip_at(self, pos) -> str:
         """Gibt Tooltip-Text zurück wenn die Maus nahe einem Chroma-Shape ist."""
         if not self._chroma_data or self.segment is None:
             return ""
 
-        lg_idx = next(
-            (i for i, t in enumerate(TRACKS) if t["label"] == "Lead Guitar"),
-            None,
-        )
+        lg_idx = _TRACK_IDX.get("Lead Guitar")
         if lg_idx is None:
             return ""
 
@@ -756,11 +874,7 @@ class TimelineWidget(QWidget):
         for entry in self._chroma_data:
             bx = LABEL_W + int((entry["t"] - seg_t0) * pps) - ox
             if abs(bx - pos.x()) <= CLICK_R:
-                try:
-                    from chroma_viz import chroma_tooltip
-                    return chroma_tooltip(entry["chroma"])
-                except ImportError:
-                    return ""
+                return chroma_tooltip(entry["chroma"])
         return ""
 
     def _bass_tip_at(self, pos) -> str:
@@ -768,10 +882,7 @@ class TimelineWidget(QWidget):
         if not self._bass_data or self.segment is None:
             return ""
 
-        bass_idx = next(
-            (i for i, t in enumerate(TRACKS) if t["label"] == "Bass"),
-            None,
-        )
+        bass_idx = _TRACK_IDX.get("Bass")
         if bass_idx is None:
             return ""
 
@@ -789,24 +900,20 @@ class TimelineWidget(QWidget):
         for entry in self._bass_data:
             bx = LABEL_W + int((entry["t"] - seg_t0) * pps) - ox
             if abs(bx - pos.x()) <= CLICK_R:
-                try:
-                    from chroma_viz import chroma_tooltip
-                    rhythm = float(entry.get("rhythm", 0.5))
-                    rhythm_desc = (
-                        "präzise" if rhythm >= 0.8 else
-                        "mäßig"   if rhythm >= 0.5 else
-                        "unregelmäßig"
-                    )
-                    tip = chroma_tooltip(entry["chroma"])
-                    tip += f"\n8tel-Rhythmus: {int(rhythm * 100)} %  ({rhythm_desc})"
-                    return tip
-                except ImportError:
-                    return ""
+                rhythm = float(entry.get("rhythm", 0.5))
+                rhythm_desc = (
+                    "präzise" if rhythm >= 0.8 else
+                    "mäßig"   if rhythm >= 0.5 else
+                    "unregelmäßig"
+                )
+                tip = chroma_tooltip(entry["chroma"])
+                tip += f"\n8tel-Rhythmus: {int(rhythm * 100)} %  ({rhythm_desc})"
+                return tip
         return ""
 
     # ── Paint ─────────────────────────────────────────────────────────────────
 
-    def paintEvent(self, _event) -> None:
+    def paintEvent(self, event) -> None:
         p = QPainter(self)
         p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
 
@@ -828,8 +935,15 @@ class TimelineWidget(QWidget):
         self._paint_events(p, vl, vr)
         self._paint_annotation_strip(p, vl, vr)
         self._paint_anchor_strip(p, vl, vr)
+        # Track-Zeilen außerhalb des Dirty-Rects überspringen (S/M-Klicks
+        # aktualisieren nur einzelne Zeilen, siehe _update_track_rows)
+        dirty = event.rect()
+        d_top, d_bot = dirty.top(), dirty.bottom()
         for i, track in enumerate(TRACKS):
-            self._paint_track(p, i, track, TRACK_Y[i], vl, vr)
+            ty = TRACK_Y[i]
+            if ty > d_bot or ty + track["h"] <= d_top:
+                continue
+            self._paint_track(p, i, track, ty, vl, vr)
 
         # Taktstriche über alle Drum-Tracks (wenn Sim-Overlay aktiv)
         self._paint_sim_bars(p, vl, vr)
@@ -878,13 +992,13 @@ class TimelineWidget(QWidget):
             if x < LABEL_W - 16 or x > w + 16:
                 continue
 
-            matched    = anc.get("id", "") in self._sim_matched_ids
-            base_color = _ANCHOR_COLORS.get(anc.get("type", "other"), C_T3)
+            matched = anc.get("id", "") in self._sim_matched_ids
+            ring_c, dc, dim_c = _ANCHOR_SHADES.get(
+                anc.get("type", "other"), _ANCHOR_SHADES_DEFAULT)
 
             if matched:
                 r_draw = 8
                 # Farbiger Außenring (type-Farbe, halbtransparent)
-                ring_c = QColor(base_color); ring_c.setAlpha(80)
                 p.setBrush(Qt.BrushStyle.NoBrush)
                 p.setPen(QPen(ring_c, 1))
                 p.drawPolygon(QPolygon([
@@ -894,7 +1008,6 @@ class TimelineWidget(QWidget):
                     QPoint(x - r_draw - 3, cy),
                 ]))
                 # Gefüllter Kern (leicht transparent)
-                dc = QColor(base_color); dc.setAlpha(200)
                 p.setBrush(QBrush(dc))
                 p.setPen(Qt.PenStyle.NoPen)
                 p.drawPolygon(QPolygon([
@@ -907,16 +1020,14 @@ class TimelineWidget(QWidget):
                 label = anc.get("event", "")
                 if len(label) > 14:
                     label = label[:13] + "…"
-                tc = QColor(base_color); tc.setAlpha(200)
-                p.setPen(tc)
+                p.setPen(dc)
                 p.setFont(FONT_BTN)
                 p.drawText(x + r_draw + 4, y0, 110, ANCHOR_H,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            label)
             else:
                 r_draw = 4
-                dc = QColor(base_color); dc.setAlpha(70)
-                p.setBrush(QBrush(dc))
+                p.setBrush(QBrush(dim_c))
                 p.setPen(Qt.PenStyle.NoPen)
                 p.drawPolygon(QPolygon([
                     QPoint(x,          cy - r_draw),
@@ -941,8 +1052,7 @@ class TimelineWidget(QWidget):
             return
 
         # Drum-Track-Span ermitteln
-        drum_labels = {"Kick", "Snare", "Toms", "OH L+R"}
-        drum_indices = [i for i, t in enumerate(TRACKS) if t["label"] in drum_labels]
+        drum_indices = _DRUM_IDX
         if not drum_indices:
             return
 
@@ -951,8 +1061,7 @@ class TimelineWidget(QWidget):
         y_bottom = TRACK_Y[last_i] + TRACKS[last_i]["h"] - 1
 
         # Tom-Zeile für Taktnummern + BPM
-        tom_indices = [i for i, t in enumerate(TRACKS) if t["label"] == "Toms"]
-        tom_i = tom_indices[0] if tom_indices else None
+        tom_i = _TRACK_IDX.get("Toms")
 
         seg_t0 = self.segment.start_t
         pps    = self._pps
@@ -960,8 +1069,6 @@ class TimelineWidget(QWidget):
         w      = self.width()
 
         p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
-        pen_bar = QPen(QColor(255, 255, 255, 110), 1)
-        C_NUM   = QColor(0xee, 0xf0, 0xf6, 230)   # fast weiß, gut lesbar
 
         # ── Taktstriche + Taktnummern ──────────────────────────────────────────
         for bar_num, bar_t in enumerate(self._sim_bar_times, start=1):
@@ -969,7 +1076,7 @@ class TimelineWidget(QWidget):
             if bx < LABEL_W or bx > w:
                 continue
 
-            p.setPen(pen_bar)
+            p.setPen(_SIM_BAR_PEN)
             p.drawLine(bx, y_top, bx, y_bottom)
 
             if bar_num % 5 == 0 and tom_i is not None:
@@ -980,11 +1087,11 @@ class TimelineWidget(QWidget):
                 lbl_w = 26
                 lbl_y = ty + th * 2 // 3
                 lbl_h = th // 3
-                p.fillRect(bx + 1, lbl_y, lbl_w, lbl_h, QColor(0, 0, 0, 160))
+                p.fillRect(bx + 1, lbl_y, lbl_w, lbl_h, _C_LABEL_BG)
                 p.setFont(FONT_BTN)
-                p.setPen(C_NUM)
+                p.setPen(_C_SIM_NUM)
                 p.drawText(bx + 2, lbl_y, lbl_w, lbl_h,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            lbl)
 
         # ── BPM-Timeline in Tom-Zeile (oberes Drittel) ────────────────────────
@@ -993,17 +1100,16 @@ class TimelineWidget(QWidget):
             th = TRACKS[tom_i]["h"]
             bpm_y    = ty + 1
             bpm_h    = th * 2 // 3   # obere 2/3 der Zeile (Platz ohne Taktnummern)
-            C_BPM    = QColor(0xee, 0xf0, 0xf6, 240)   # helles Weiß
             p.setFont(FONT_BTN)
             for bpm_t, bpm_val in self._sim_bpm_timeline:
                 bx = LABEL_W + int((bpm_t - seg_t0) * pps) - ox
                 if bx < LABEL_W or bx > w:
                     continue
                 lbl_w = 32
-                p.fillRect(bx + 2, bpm_y, lbl_w, bpm_h, QColor(0, 0, 0, 160))
-                p.setPen(C_BPM)
+                p.fillRect(bx + 2, bpm_y, lbl_w, bpm_h, _C_LABEL_BG)
+                p.setPen(_C_SIM_BPM)
                 p.drawText(bx + 3, bpm_y, lbl_w, bpm_h,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            str(bpm_val))
 
     # ── Chroma shapes (Lead Guitar row) ──────────────────────────────────────
@@ -1014,87 +1120,8 @@ class TimelineWidget(QWidget):
             return
         if not self._chroma_data or self.segment is None:
             return
-
-        # Lead-Guitar-Track finden
-        lg_idx = next(
-            (i for i, t in enumerate(TRACKS) if t["label"] == "Lead Guitar"),
-            None,
-        )
-        if lg_idx is None:
-            return
-
-        try:
-            from chroma_viz import chroma_to_rgb, chroma_shape_type
-        except ImportError:
-            return
-
-        seg_t0 = self.segment.start_t
-        pps    = self._pps
-        ox     = self._scroll_x
-        w      = self.width()
-
-        ty = TRACK_Y[lg_idx]
-        th = TRACKS[lg_idx]["h"]
-        cy = ty + th // 2
-
-        p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-
-        for entry in self._chroma_data:
-            bx = LABEL_W + int((entry["t"] - seg_t0) * pps) - ox
-            if bx < LABEL_W or bx > w:
-                continue
-
-            chroma = entry["chroma"]
-            rgb = chroma_to_rgb(chroma)
-            color = QColor(rgb[0], rgb[1], rgb[2], 220)
-            shape = chroma_shape_type(chroma)
-
-            r = min(th // 2 - 2, 8)
-            if r < 1:
-                continue
-
-            p.setPen(QPen(color, 1))
-            p.setBrush(QBrush(color))
-
-            if shape == "line":
-                pen = QPen(color, 2)
-                p.setPen(pen)
-                p.setBrush(Qt.BrushStyle.NoBrush)
-                p.drawLine(bx, cy - r, bx, cy + r)
-            elif shape == "triangle":
-                poly = QPolygon([
-                    QPoint(bx,     cy - r),
-                    QPoint(bx - r, cy + r),
-                    QPoint(bx + r, cy + r),
-                ])
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
-                p.drawPolygon(poly)
-            elif shape == "diamond":
-                poly = QPolygon([
-                    QPoint(bx,     cy - r),
-                    QPoint(bx + r, cy),
-                    QPoint(bx,     cy + r),
-                    QPoint(bx - r, cy),
-                ])
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
-                p.drawPolygon(poly)
-            elif shape == "pentagon":
-                pts = [
-                    QPoint(bx + int(round(r * math.cos(-math.pi / 2 + 2 * math.pi * i / 5))),
-                           cy + int(round(r * math.sin(-math.pi / 2 + 2 * math.pi * i / 5))))
-                    for i in range(5)
-                ]
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
-                p.drawPolygon(QPolygon(pts))
-            else:  # circle
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
-                p.drawEllipse(QPoint(bx, cy), r, r)
-
-        p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        self._paint_shape_row(p, self._chroma_data, _TRACK_IDX.get("Lead Guitar"),
+                              _chroma_alpha)
 
     # ── Bass shapes (Bass row) ────────────────────────────────────────────────
 
@@ -1111,61 +1138,58 @@ class TimelineWidget(QWidget):
             return
         if not self._bass_data or self.segment is None:
             return
+        self._paint_shape_row(p, self._bass_data, _TRACK_IDX.get("Bass"),
+                              _bass_alpha)
 
-        bass_idx = next(
-            (i for i, t in enumerate(TRACKS) if t["label"] == "Bass"),
-            None,
-        )
-        if bass_idx is None:
+    def _paint_shape_row(self, p: QPainter, entries: list[dict],
+                         track_idx: Optional[int], alpha_of) -> None:
+        """Gemeinsamer Zeichner für Chroma- und Bass-Shapes einer Track-Zeile.
+
+        alpha_of(entry) liefert die Deckkraft; Form und Farbe kommen aus dem
+        Chroma-Vektor des Eintrags.
+        """
+        if track_idx is None:
             return
 
-        try:
-            from chroma_viz import chroma_to_rgb, chroma_shape_type
-        except ImportError:
+        th = TRACKS[track_idx]["h"]
+        r  = min(th // 2 - 2, 8)
+        if r < 1:
             return
 
         seg_t0 = self.segment.start_t
         pps    = self._pps
         ox     = self._scroll_x
         w      = self.width()
-
-        ty = TRACK_Y[bass_idx]
-        th = TRACKS[bass_idx]["h"]
-        cy = ty + th // 2
+        cy     = TRACK_Y[track_idx] + th // 2
+        penta  = [QPoint(int(round(r * c)), int(round(r * s))) for c, s in _PENTAGON_UNIT]
 
         p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
 
-        for entry in self._bass_data:
+        for entry in entries:
             bx = LABEL_W + int((entry["t"] - seg_t0) * pps) - ox
             if bx < LABEL_W or bx > w:
                 continue
 
             chroma = entry["chroma"]
-            rhythm = float(entry.get("rhythm", 0.5))
-
             rgb   = chroma_to_rgb(chroma)
-            alpha = max(40, int(40 + rhythm * 180))   # 40 (unregelmäßig) … 220 (perfekte 8tel)
-            color = QColor(rgb[0], rgb[1], rgb[2], alpha)
+            color = QColor(rgb[0], rgb[1], rgb[2], alpha_of(entry))
             shape = chroma_shape_type(chroma)
-            r     = min(th // 2 - 2, 8)
-            if r < 1:
-                continue
 
             if shape == "line":
                 p.setPen(QPen(color, 2))
                 p.setBrush(Qt.BrushStyle.NoBrush)
                 p.drawLine(bx, cy - r, bx, cy + r)
-            elif shape == "triangle":
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
+                continue
+
+            p.setPen(QPen(color, 1))
+            p.setBrush(QBrush(color))
+            if shape == "triangle":
                 p.drawPolygon(QPolygon([
                     QPoint(bx,     cy - r),
                     QPoint(bx - r, cy + r),
                     QPoint(bx + r, cy + r),
                 ]))
             elif shape == "diamond":
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
                 p.drawPolygon(QPolygon([
                     QPoint(bx,     cy - r),
                     QPoint(bx + r, cy),
@@ -1173,17 +1197,9 @@ class TimelineWidget(QWidget):
                     QPoint(bx - r, cy),
                 ]))
             elif shape == "pentagon":
-                pts = [
-                    QPoint(bx + int(round(r * math.cos(-math.pi / 2 + 2 * math.pi * i / 5))),
-                           cy + int(round(r * math.sin(-math.pi / 2 + 2 * math.pi * i / 5))))
-                    for i in range(5)
-                ]
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
-                p.drawPolygon(QPolygon(pts))
+                c = QPoint(bx, cy)
+                p.drawPolygon(QPolygon([c + d for d in penta]))
             else:  # circle
-                p.setPen(QPen(color, 1))
-                p.setBrush(QBrush(color))
                 p.drawEllipse(QPoint(bx, cy), r, r)
 
         p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
@@ -1214,8 +1230,8 @@ class TimelineWidget(QWidget):
                     p.setPen(C_T2)
                     p.drawLine(x, RULER_H - 12, x, RULER_H - 1)
                     p.drawText(x + 3, 2, 90, RULER_H - 4,
-                               Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                               qh.strftime("%H:%M"))
+                               ALIGN_LV,
+                               f"{qh.hour:02d}:{qh.minute:02d}")
                 qh += timedelta(minutes=15)
         else:
             # Fallback: dynamic relative time ticks (no clock data)
@@ -1236,8 +1252,8 @@ class TimelineWidget(QWidget):
                         p.setPen(C_T2)
                         p.drawLine(x, RULER_H - 12, x, RULER_H - 1)
                         p.drawText(x + 3, 2, 90, RULER_H - 4,
-                                   Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                                   _fmt_t(t))
+                                   ALIGN_LV,
+                                   fmt_mmss(t))
                     else:
                         p.setPen(C_T4)
                         p.drawLine(x, RULER_H - 5, x, RULER_H - 1)
@@ -1272,14 +1288,25 @@ class TimelineWidget(QWidget):
             ww   = max(1, int(0.05 * pps))    # pixel width per 50 ms window
             C_ACT = QColor(0x00, 0xdc, 0x82, 110)   # green – active
             C_SIL = QColor(0x5c, 0x60, 0x80,  70)   # grey  – silent
+            # Ein drawRects-Aufruf je Farbe statt ein fillRect pro 50-ms-Fenster
+            act_rects: list[QRect] = []
+            sil_rects: list[QRect] = []
             for t_win, is_active in self._scan_windows:
                 ex = LABEL_W + int(t_win * pps) - ox
                 if ex > w:
                     break
                 if ex + ww < LABEL_W:
                     continue
-                p.fillRect(max(LABEL_W, ex), by, ww, bh,
-                           C_ACT if is_active else C_SIL)
+                (act_rects if is_active else sil_rects).append(
+                    QRect(max(LABEL_W, ex), by, ww, bh))
+            p.setPen(Qt.PenStyle.NoPen)
+            if act_rects:
+                p.setBrush(QBrush(C_ACT))
+                p.drawRects(act_rects)
+            if sil_rects:
+                p.setBrush(QBrush(C_SIL))
+                p.drawRects(sil_rects)
+            p.setBrush(Qt.BrushStyle.NoBrush)
             # Scan-head line
             if self._scan_pos >= 0:
                 sx = LABEL_W + int(self._scan_pos * pps) - ox
@@ -1301,7 +1328,7 @@ class TimelineWidget(QWidget):
                 p.drawLine(bx, y0, bx, y0 + ANNOT_H - 2)
                 p.setPen(C_FRAG)
                 p.drawText(bx + 3, y0 + 1, 40, ANNOT_H - 2,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            f"F{k + 2}")
 
         if not self.segment or not self._bar_markers:
@@ -1331,7 +1358,7 @@ class TimelineWidget(QWidget):
                 if is_part:
                     frag_label += f" {m.part_name}"
                 p.drawText(ex + 3, y0 + 1, 120, ANNOT_H - 2,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            frag_label)
             else:
                 c = C_GREEN if is_part else C_AMBER
@@ -1346,11 +1373,11 @@ class TimelineWidget(QWidget):
                     label = f"{m.bar_num} {m.part_name}"
                 p.setPen(c)
                 p.drawText(ex + 2, y0 + 1, 120, ANNOT_H - 2,
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                           ALIGN_LV,
                            label)
 
                 # Quantisierung fehlgeschlagen → rotes „?" oben an der Linie
-                if getattr(m, "quantize_failed", False):
+                if m.quantize_failed:
                     p.setFont(FONT_BTN)
                     p.setPen(C_RED)
                     p.drawText(ex - 5, y0, 12, 12,
@@ -1406,32 +1433,22 @@ class TimelineWidget(QWidget):
                         if conf > 0.82:
                             p.setPen(c)
                             p.drawText(ex + 2, y0, 70, EVENTS_H // 2,
-                                       Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                                       ALIGN_LV,
                                        part)
 
                 elif ev.type == "user":
-                    action = ev.data.get("action", "")
-                    if action in ("next", "prev", "goto", "accent"):
-                        label_map = {"next": "->", "prev": "<-",
-                                     "goto": "~>", "accent": "*"}
+                    mark = _USER_ACTION_MARKS.get(ev.data.get("action", ""))
+                    if mark is not None:
                         p.setPen(QPen(C_GREEN, 2))
                         p.drawLine(ex, y0 + EVENTS_H // 3, ex, y0 + EVENTS_H - 2)
                         p.setPen(C_GREEN)
                         p.drawText(ex + 2, y0 + EVENTS_H // 3, 20, EVENTS_H // 2,
-                                   Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                                   label_map.get(action, "?"))
+                                   ALIGN_LV,
+                                   mark)
 
         # ── Simulierte Kick/Snare-Onsets als Diamonds ────────────────────────
         p.setOpacity(1.0)
 
-        def _diamond(cx: int, cy: int, r: int = 4) -> QPolygon:
-            return QPolygon([
-                QPoint(cx,     cy - r),
-                QPoint(cx + r, cy    ),
-                QPoint(cx,     cy + r),
-                QPoint(cx - r, cy    ),
-            ])
-
         R = 4
         cy_top    = y0 + EVENTS_H // 4      # Snares oben
         cy_bottom = y0 + EVENTS_H * 3 // 4  # Kicks unten
@@ -1527,7 +1544,7 @@ class TimelineWidget(QWidget):
             p.setPen(C_T4)
             p.setFont(FONT_MONO)
             p.drawText(LABEL_W + 6, y, w - LABEL_W - 8, h,
-                       Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                       ALIGN_LV,
                        "Lade...")
             return
 
@@ -1587,11 +1604,11 @@ class TimelineWidget(QWidget):
         p.setBrush(QBrush(fill_c))
         p.drawPolygon(poly)
 
+        # Konturen als je ein Polyline-Aufruf statt 2·N einzelner drawLine()
         p.setPen(QPen(color, 1))
         p.setBrush(Qt.BrushStyle.NoBrush)
-        for i in range(len(top_pts) - 1):
-            p.drawLine(top_pts[i], top_pts[i + 1])
-            p.drawLine(bot_pts[i], bot_pts[i + 1])
+        p.drawPolyline(QPolygon(top_pts))
+        p.drawPolyline(QPolygon(bot_pts))
 
         # Beat / snare / downbeat diamonds on designated tracks
         self._paint_event_markers(p, track, y, h, vl, vr)
@@ -1610,9 +1627,12 @@ class TimelineWidget(QWidget):
         pps  = self._pps
         ox   = self._scroll_x
 
+        ts     = self._vocal_ts
+        active = self._vocal_active
+
         # Fensterdauer in Pixeln (aus erstem Paar ableiten; Fallback 3px)
-        if len(self._vocal_data) >= 2:
-            dt_sec  = self._vocal_data[1]["t"] - self._vocal_data[0]["t"]
+        if len(ts) >= 2:
+            dt_sec  = ts[1] - ts[0]
             win_px  = max(2, int(dt_sec * pps))
         else:
             win_px = 3
@@ -1627,21 +1647,23 @@ class TimelineWidget(QWidget):
         t0_vis = seg.start_t + (vl - LABEL_W + ox) / pps
         t1_vis = seg.start_t + (vr         + ox) / pps
 
-        import bisect as _bisect
-        ts = [e["t"] for e in self._vocal_data]
         i_start = max(0, _bisect.bisect_left(ts, t0_vis) - 1)
 
-        for i in range(i_start, len(self._vocal_data)):
-            entry = self._vocal_data[i]
-            if entry["t"] > t1_vis:
+        # Sichtbare Fenster sammeln und in einem drawRects-Aufruf zeichnen
+        rects: list[QRect] = []
+        for i in range(i_start, len(ts)):
+            t = ts[i]
+            if t > t1_vis:
                 break
-            if not entry["active"]:
+            if not active[i]:
                 continue
-            x = LABEL_W + int((entry["t"] - seg.start_t) * pps) - ox
+            x = LABEL_W + int((t - seg.start_t) * pps) - ox
             x0 = max(LABEL_W, x)
             x1 = min(self.width(), x + win_px)
             if x1 > x0:
-                p.fillRect(x0, y, x1 - x0, h, VOCAL_ACTIVE)
+                rects.append(QRect(x0, y, x1 - x0, h))
+        if rects:
+            p.drawRects(rects)
 
     def _paint_event_markers(self, p: QPainter, track: dict,
                               ty: int, th: int, vl: int, vr: int) -> None:
@@ -1664,19 +1686,6 @@ class TimelineWidget(QWidget):
         r = _DIAMOND_R
         cy = ty + th - 2 - r   # bottom-aligned diamond center
 
-        def _draw_diamond(ex: int, color: QColor, alpha: int = 180, radius: int = r) -> None:
-            d = QPolygon([
-                QPoint(ex,          cy - radius),
-                QPoint(ex + radius, cy),
-                QPoint(ex,          cy + radius),
-                QPoint(ex - radius, cy),
-            ])
-            fill = QColor(color)
-            fill.setAlpha(alpha)
-            p.setPen(QPen(color, 1))
-            p.setBrush(QBrush(fill))
-            p.drawPolygon(d)
-
         p.setRenderHint(QPainter.RenderHint.Antialiasing, True)
 
         # ── Original-JSONL-Events ──────────────────────────────────────────────
@@ -1691,7 +1700,7 @@ class TimelineWidget(QWidget):
                 color = self._marker_color_for(ev, track_chs)
                 if color is None:
                     continue
-                _draw_diamond(ex, color, alpha=orig_alpha)
+                _draw_diamond(p, ex, cy, color, alpha=orig_alpha)
 
         # ── Sim-Kick/Snare auf Kanal-Rows überlagern (nur im Overlay-Modus) ──
         if self._sim_overlay and (self._sim_kicks or self._sim_snares):
@@ -1701,13 +1710,13 @@ class TimelineWidget(QWidget):
                 for t_s in self._sim_snares:
                     ex = LABEL_W + int((t_s - seg_t0) * pps) - ox
                     if LABEL_W - r <= ex <= w + r:
-                        _draw_diamond(ex, C_CYAN, alpha=160)
+                        _draw_diamond(p, ex, cy, C_CYAN, alpha=160)
 
             if track_chs & KICK_MARKER_CHS:
                 for t_k in self._sim_kicks:
                     ex = LABEL_W + int((t_k - seg_t0) * pps) - ox
                     if LABEL_W - r <= ex <= w + r:
-                        _draw_diamond(ex, C_AMBER, alpha=160)
+                        _draw_diamond(p, ex, cy, C_AMBER, alpha=160)
 
         # ── Sim-Crashes auf OH L+R Row (roter Diamond, größer) ────────────────
         if self._sim_overlay and self._sim_crashes and (track_chs & BEAT_MARKER_CHS):
@@ -1746,7 +1755,7 @@ class TimelineWidget(QWidget):
         p.setFont(FONT_MONO)
         p.setPen(color)
         p.drawText(6, RULER_H, LABEL_W - 10, EVENTS_H,
-                   Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                   ALIGN_LV,
                    summary)
 
         # Anchor cell (between Events strip and first Track) — immer sichtbar
@@ -1758,7 +1767,7 @@ class TimelineWidget(QWidget):
         p.setPen(C_AMBER if matched_n > 0 else C_T4)
         anc_label = f"⚓ Anker  {matched_n}/{total_n}" if total_n > 0 else "⚓ Anker"
         p.drawText(6, y0_anc, LABEL_W - 10, ANCHOR_H,
-                   Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                   ALIGN_LV,
                    anc_label)
         p.setPen(C_BORDER)
         p.drawLine(0, y0_anc + ANCHOR_H - 1, LABEL_W, y0_anc + ANCHOR_H - 1)
@@ -1777,7 +1786,7 @@ class TimelineWidget(QWidget):
             p.setFont(FONT_LABEL)
             p.setPen(C_T1 if track["is_sum"] else C_T2)
             p.drawText(10, y, LABEL_W - 52, th,
-                       Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                       ALIGN_LV,
                        track["label"])
 
             # S/M buttons
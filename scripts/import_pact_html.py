@@ -83,15 +83,22 @@ class RepertoireParser(HTMLParser):
             self.current_cell += f"&{name};"
 
 
+# m:ss bzw. mm:ss — Sekunden 0–59, alles andere gilt als ungültig
+_MMSS_RE = re.compile(r"(\d{1,3}):([0-5]?\d)")
+
+# QLC+-Chaser-Steps: Zeitstempel/Timing-Klammer am Note-Ende und Emojis in
+# Scene-Namen — laufen pro Step, daher einmal kompiliert
+_NOTE_TS_RE = re.compile(r"(\d+:\d+)\s*$")
+_NOTE_BRACKET_RE = re.compile(r"\[[\d:s]+\]\s*$")
+_EMOJI_RE = re.compile(r"[\U0001F300-\U0001FAFF\u2600-\u27BF\u2B50\u26A0\uFE0F]+")
+
+
 def parse_duration_sec(duration_str: str) -> int:
-    """'3:30' → 210"""
-    if not duration_str or ":" not in duration_str:
-        return 0
-    parts = duration_str.split(":")
-    try:
-        return int(parts[0]) * 60 + int(parts[1])
-    except (ValueError, IndexError):
+    """'3:30' → 210 (ungültige Angaben → 0)"""
+    m = _MMSS_RE.fullmatch(duration_str.strip())
+    if not m:
         return 0
+    return int(m[1]) * 60 + int(m[2])
 
 
 def is_part_name(text: str) -> bool:
@@ -340,17 +347,11 @@ def load_stringbreak_lyrics(stringbreak_path: Path) -> dict[str, list[dict]]:
     return lyrics_by_name
 
 
-def match_section_to_part(section_name: str, part_name: str) -> bool:
-    """Prüft ob eine Lyrics-Sektion zu einem Part passt (fuzzy)."""
-    sn = section_name.lower().strip()
-    pn = part_name.lower().strip()
-
-    # Exakter Match
-    if sn == pn:
-        return True
-
-    # Kernwort-Match (VERSE 1 ↔ Verse 1, CHORUS ↔ Chorus (lunch))
-    section_keywords = {
+# Kernwort-Match (VERSE 1 ↔ Verse 1, CHORUS ↔ Chorus (lunch)) — Typ →
+# Suchwörter inkl. Typ selbst, einmal gebaut statt pro Sektion×Part-Paar
+_SECTION_KEYWORDS: dict[str, tuple[str, ...]] = {
+    key: (key, *aliases)
+    for key, aliases in {
         "verse": ["verse", "str", "strophe"],
         "chorus": ["chorus", "ref", "refrain"],
         "theme": ["theme", "thema", "intro", "interlude"],
@@ -359,17 +360,30 @@ def match_section_to_part(section_name: str, part_name: str) -> bool:
         "outro": ["outro", "end", "ausklang", "coda"],
         "solo": ["solo"],
         "interlude": ["interlude"],
-    }
+    }.items()
+}
+_NUM_RE = re.compile(r"\d+")
+_NUM_STRIP_RE = re.compile(r"[\d:]+")
+
+
+def match_section_to_part(section_name: str, part_name: str) -> bool:
+    """Prüft ob eine Lyrics-Sektion zu einem Part passt (fuzzy)."""
+    sn = section_name.lower().strip()
+    pn = part_name.lower().strip()
+
+    # Exakter Match
+    if sn == pn:
+        return True
 
     # Nummer extrahieren (Verse 1, Chorus 2, etc.)
-    sn_num = re.search(r'\d+', sn)
-    pn_num = re.search(r'\d+', pn)
-    sn_base = re.sub(r'[\d:]+', '', sn).strip()
-    pn_base = re.sub(r'[\d:]+', '', pn).strip()
-
-    for key, aliases in section_keywords.items():
-        if any(a in sn_base for a in [key] + aliases):
-            if any(a in pn_base for a in [key] + aliases):
+    sn_num = _NUM_RE.search(sn)
+    pn_num = _NUM_RE.search(pn)
+    sn_base = _NUM_STRIP_RE.sub("", sn).strip()
+    pn_base = _NUM_STRIP_RE.sub("", pn).strip()
+
+    for words in _SECTION_KEYWORDS.values():
+        if any(a in sn_base for a in words):
+            if any(a in pn_base for a in words):
                 # Basis-Typ matched — prüfe Nummer
                 if sn_num and pn_num:
                     return sn_num.group() == pn_num.group()
@@ -523,18 +537,17 @@ def load_qlc_chasers(qxw_path: Path) -> dict:
             scene_info = func_lookup.get(scene_id, {})
             scene_name = scene_info.get('name', '')
             # Emojis aus Scene-Namen entfernen für saubere DB
-            scene_name_clean = re.sub(r'[\U0001F300-\U0001FAFF\u2600-\u27BF\u2B50\u26A0\uFE0F]+',
-                                        '', scene_name).strip()
+            scene_name_clean = _EMOJI_RE.sub('', scene_name).strip()
 
             # Timestamp aus Note extrahieren (z.B. "Verse 1 0:16" → "0:16")
             timestamp = ''
-            ts_match = re.search(r'(\d+:\d+)\s*$', note)
+            ts_match = _NOTE_TS_RE.search(note)
             if ts_match:
                 timestamp = ts_match.group(1)
                 note = note[:ts_match.start()].strip()
 
             # Timing-Klammern extrahieren (z.B. "[26s]", "[1:05]")
-            bracket_match = re.search(r'\[[\d:s]+\]\s*$', note)
+            bracket_match = _NOTE_BRACKET_RE.search(note)
             if bracket_match:
                 if not timestamp:
                     timestamp = bracket_match.group().strip('[]')
@@ -848,8 +861,7 @@ def main():
             ftype = f.get('Type', '')
             if ftype in ('Collection', 'Scene') and fid.isdigit():
                 # Emojis entfernen
-                clean_name = re.sub(r'[\U0001F300-\U0001FAFF\u2600-\u27BF\u2B50\u26A0\uFE0F]+',
-                                    '', fname).strip()
+                clean_name = _EMOJI_RE.sub('', fname).strip()
                 if clean_name:
                     scene_palette[fid] = clean_name
         db["meta"]["qlc_scenes"] = scene_palette
@@ -80,6 +80,14 @@ class LiveReadApiShapeTest(unittest.TestCase):
         self.assertIsInstance(song["parts"], list)
         self.assertEqual(song["anchors"][0]["id"], "anc_1")
 
+    def test_get_songs_follows_db_swap(self) -> None:
+        first = asyncio.run(live_main.get_songs())
+        self.assertIs(asyncio.run(live_main.get_songs()), first)
+        swapped = _fixture_db()
+        swapped["songs"]["S1"]["name"] = "Renamed"
+        live_main.db = swapped
+        self.assertEqual(asyncio.run(live_main.get_songs())["S1"]["name"], "Renamed")
+
     def test_get_song_bars_shape(self) -> None:
         out = asyncio.run(live_main.get_song_bars("S1"))
         self.assertIsInstance(out, list)
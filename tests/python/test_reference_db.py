@@ -11,8 +11,10 @@ detection package is unavailable (e.g. this CI sandbox).
 
 from __future__ import annotations
 
+import sqlite3
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -40,6 +42,7 @@ class ReferenceDBContractTest(unittest.TestCase):
         self.db = ReferenceDB(Path(self._tmp.name) / "reference.db")
 
     def tearDown(self) -> None:
+        self.db.close()
         self._tmp.cleanup()
 
     def test_song_roundtrip(self) -> None:
@@ -69,6 +72,15 @@ class ReferenceDBContractTest(unittest.TestCase):
         # bar_num is absolute to song, no reset at part boundary (verified contract)
         self.assertEqual([b.bar_num for b in self.db.get_bars_for_song("s")], [1, 2, 3])
         self.assertEqual(self.db.get_bar_by_num("s", 2).part_name, "Intro")
+        self.assertEqual(
+            {b.bar_id: b for b in self.db.get_all_bars()},
+            {b.bar_id: b for b in bars},
+        )
+        # get_all_bars() liefert nach (song_id, bar_num) sortiert
+        self.db.upsert_bar(BarRecord(bar_id="A2", song_id="a", bar_num=2, part_name="", audio_path=""))
+        self.db.upsert_bar(BarRecord(bar_id="A1", song_id="a", bar_num=1, part_name="", audio_path=""))
+        self.assertEqual([b.bar_id for b in self.db.get_all_bars()],
+                         ["A1", "A2", "B1", "B2", "B3"])
 
         parts = self.db.get_parts_for_song("s")
         by_name = {p["part_name"]: p for p in parts}
@@ -92,12 +104,137 @@ class ReferenceDBContractTest(unittest.TestCase):
         np.testing.assert_array_almost_equal(got.chroma, np.arange(12))
         self.assertAlmostEqual(got.rms, 0.5, places=5)
 
+    def test_upsert_features_writes_batch_and_updates(self) -> None:
+        self.db.upsert_song(SongRecord(song_id="s", name="S", bpm=120.0, total_bars=2))
+        for n in (1, 2):
+            self.db.upsert_bar(BarRecord(bar_id=f"B{n}", song_id="s", bar_num=n,
+                                         part_name="", audio_path=""))
+
+        def fv(bar_id: str, rms: float) -> FeatureVector:
+            return FeatureVector(bar_id=bar_id, chroma=np.zeros(12, dtype=np.float32),
+                                 mfcc=np.zeros(20, dtype=np.float32),
+                                 onset=np.zeros(16, dtype=np.float32), rms=rms)
+
+        self.db.upsert_features([fv("B1", 0.1), fv("B2", 0.2)])
+        self.db.upsert_features([fv("B2", 0.7)])
+        self.db.upsert_features([])
+        self.assertEqual(self.db.stats()["feature_vectors"], 2)
+        self.assertAlmostEqual(self.db.get_feature("B1").rms, 0.1, places=5)
+        self.assertAlmostEqual(self.db.get_feature("B2").rms, 0.7, places=5)
+
     def test_delete_song_cascades(self) -> None:
         self.db.upsert_song(SongRecord(song_id="s", name="S", bpm=120.0, total_bars=1))
         self.db.upsert_bar(BarRecord(bar_id="B1", song_id="s", bar_num=1, part_name="", audio_path=""))
+        self.db.upsert_feature(FeatureVector(
+            bar_id="B1",
+            chroma=np.zeros(12, dtype=np.float32),
+            mfcc=np.zeros(20, dtype=np.float32),
+            onset=np.zeros(16, dtype=np.float32),
+            rms=0.0,
+        ))
         self.db.delete_song("s")
         self.assertIsNone(self.db.get_song("s"))
         self.assertEqual(self.db.get_bars_for_song("s"), [])
+        self.assertIsNone(self.db.get_feature("B1"))
+
+    def test_upsert_bar_chromas_inserts_then_averages(self) -> None:
+        self.db.upsert_song(SongRecord(song_id="s", name="S", bpm=120.0, total_bars=2))
+        for n in (1, 2):
+            self.db.upsert_bar(BarRecord(bar_id=f"B{n}", song_id="s", bar_num=n, part_name="", audio_path=""))
+        ones = np.ones(12, dtype=np.float32)
+        self.assertEqual(self.db.upsert_bar_chromas("s", {1: ones, 2: ones, 99: ones}), 2)
+        self.assertTrue(self.db.upsert_bar_chroma("s", 1, ones * 3))
+        np.testing.assert_array_almost_equal(self.db.get_feature("B1").chroma, ones * 2)
+        np.testing.assert_array_almost_equal(self.db.get_feature("B2").chroma, ones)
+        self.assertFalse(self.db.upsert_bar_chroma("s", 99, ones))
+        self.assertEqual(self.db.feature_bar_ids("s"), {"B1", "B2"})
+        self.assertEqual(self.db.feature_bar_ids("other"), set())
+
+    def test_upsert_bars_writes_only_changed_rows(self) -> None:
+        self.db.upsert_song(SongRecord(song_id="s", name="S", bpm=120.0, total_bars=2))
+        bars = [
+            BarRecord(bar_id=f"B{n}", song_id="s", bar_num=n, part_name="Intro", audio_path="")
+            for n in (1, 2)
+        ]
+        self.assertEqual(self.db.upsert_bars(bars), 2)
+        self.assertEqual(self.db.upsert_bars(bars), 0)
+        bars[1] = BarRecord(bar_id="B2", song_id="s", bar_num=2, part_name="Verse", audio_path="")
+        self.assertEqual(self.db.upsert_bars(bars), 1)
+        self.assertEqual(self.db.get_bar_by_num("s", 2).part_name, "Verse")
+        self.assertEqual(self.db.upsert_bars([]), 0)
+
+    def test_transaction_commits_once_or_rolls_back(self) -> None:
+        with self.db.transaction():
+            self.db.upsert_song(SongRecord(song_id="a", name="A", bpm=120.0, total_bars=0))
+            self.db.upsert_song(SongRecord(song_id="b", name="B", bpm=120.0, total_bars=0))
+        self.assertEqual({s.song_id for s in self.db.list_songs()}, {"a", "b"})
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.upsert_song(SongRecord(song_id="c", name="C", bpm=120.0, total_bars=0))
+                raise RuntimeError("abort")
+        self.assertIsNone(self.db.get_song("c"))
+
+    def test_connections_use_wal_with_synchronous_normal(self) -> None:
+        with self.db._conn() as con:
+            self.assertEqual(con.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(con.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(con.execute("PRAGMA temp_store").fetchone()[0], 2)
+            self.assertEqual(con.execute("PRAGMA busy_timeout").fetchone()[0], 10000)
+
+    def test_connection_is_reused_per_thread(self) -> None:
+        with self.db._conn() as first:
+            pass
+        with self.db._conn() as second:
+            self.assertIs(first, second)
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(self.db._thread_conn()))
+        t.start()
+        t.join()
+        self.assertIsNot(seen[0], first)
+
+    def test_close_closes_connections_of_other_threads(self) -> None:
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(self.db._thread_conn()))
+        t.start()
+        t.join()
+        self.db.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            seen[0].execute("SELECT 1")
+        # Danach öffnet der Thread eine frische Verbindung
+        self.assertEqual(self.db.stats()["songs"], 0)
+
+    def test_data_version_changes_on_foreign_and_own_writes(self) -> None:
+        v0 = self.db.data_version()
+        self.assertEqual(self.db.data_version(), v0)
+        other = ReferenceDB(self.db.path)
+        try:
+            other.upsert_song(SongRecord(song_id="s1", name="A", bpm=120.0, total_bars=4))
+        finally:
+            other.close()
+        v1 = self.db.data_version()
+        self.assertNotEqual(v1, v0)
+        self.db.upsert_song(SongRecord(song_id="s2", name="B", bpm=120.0, total_bars=4))
+        self.assertNotEqual(self.db.data_version(), v1)
+
+    def test_data_version_is_comparable_across_threads(self) -> None:
+        # set_song läuft über asyncio.to_thread: Speichern und Prüfen der
+        # Version passieren meist auf verschiedenen Pool-Threads
+        def on_thread(fn):
+            out = []
+            t = threading.Thread(target=lambda: out.append(fn()))
+            t.start()
+            t.join()
+            return out[0]
+
+        v0 = on_thread(self.db.data_version)
+        self.assertEqual(on_thread(self.db.data_version), v0)
+        other = ReferenceDB(self.db.path)
+        try:
+            other.upsert_song(SongRecord(song_id="s1", name="A", bpm=120.0, total_bars=4))
+        finally:
+            other.close()
+        self.assertNotEqual(on_thread(self.db.data_version), v0)
 
 
 if __name__ == "__main__":